@@ -0,0 +1,228 @@
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+import tracemalloc
+import numpy as np
+import constants
+import generation
+from game_state import GameState, collision_mask, update_obstacles
+from player import Player
+from population import Population
+from sensors import lane_observations
+from simulation import step_frame
+
+# Headless throughput benchmarks. Every benchmark is built from a fixed seed,
+# timed for a fixed wall-clock duration and reported as rates (higher is
+# better) plus the peak memory traced while setting it up and running it.
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_TOLERANCE = 0.2
+WARMUP_FRAMES = 200  # Frames simulated before timing so obstacles are on screen
+
+
+def _warm_game(size, seed):
+    """Seeded GameState and Population with obstacles already spread over the screen"""
+    game_state = GameState(seed)
+    population = Population.random(size, np.random.default_rng(seed))
+    leader = Player(population=population, index=0)
+    for _ in range(WARMUP_FRAMES):
+        update_obstacles(game_state, leader)
+    population.lane[:] = np.random.default_rng(seed).integers(0, constants.NUM_LANES, size)
+    return game_state, population
+
+
+def bench_update_obstacles(size, seed):
+    game_state, population = _warm_game(size, seed)
+    leader = Player(population=population, index=0)
+    def step():
+        update_obstacles(game_state, leader)
+        return size
+    return step
+
+
+def bench_check_collision(size, seed):
+    game_state, population = _warm_game(size, seed)
+    def step():
+        collision_mask(game_state, population.lane)
+        return size
+    return step
+
+
+def bench_get_state(size, seed):
+    game_state, population = _warm_game(size, seed)
+    def step():
+        np.take(lane_observations(game_state), population.lane, axis=0, out=population.states)
+        return size
+    return step
+
+
+def bench_predict(size, seed):
+    game_state, population = _warm_game(size, seed)
+    np.take(lane_observations(game_state), population.lane, axis=0, out=population.states)
+    def step():
+        population.brain.predict(population.states, population.alive)
+        return size
+    return step
+
+
+def bench_network_predict(size, seed):
+    """Single-agent NeuralNetwork.predict, cycling through the population"""
+    game_state, population = _warm_game(size, seed)
+    networks = [population.brain.network(i) for i in range(min(size, 1000))]
+    states = lane_observations(game_state)[population.lane[:len(networks)]]
+    counter = iter(range(sys.maxsize))
+    def step():
+        i = next(counter) % len(networks)
+        networks[i].predict(states[i])
+        return 1
+    return step
+
+
+def bench_new_generation(size, seed):
+    rng = np.random.default_rng(seed)
+    population = Population.random(size, rng)
+    def step():
+        nonlocal population
+        population.survival_time[:] = rng.integers(0, 2000, size)
+        population.obstacle_avoided[:] = rng.integers(0, 50, size)
+        population.moves_made[:] = rng.integers(0, 200, size)
+        population.score[:] = population.survival_time // 10 + population.obstacle_avoided * 10
+        population = generation.NewGeneration(population, rng=rng, population_size=size)
+        return size
+    return step
+
+
+def bench_frame(size, seed):
+    """Full step_frame; the population and game restart whenever everyone has died"""
+    game_state = GameState(seed)
+    population = Population.random(size, np.random.default_rng(seed))
+    def step():
+        if not population.alive_count:
+            population.reset()
+            game_state.reset(seed)
+        alive = population.alive_count
+        step_frame(game_state, population)
+        return alive
+    return step
+
+
+BENCHMARKS = {
+    "update_obstacles": bench_update_obstacles,
+    "check_collision": bench_check_collision,
+    "get_state": bench_get_state,
+    "predict": bench_predict,
+    "network_predict": bench_network_predict,
+    "new_generation": bench_new_generation,
+    "frame": bench_frame,
+}
+
+
+def time_steps(step, duration, min_calls=3):
+    """Call step until duration seconds have passed; returns (calls, agent steps, seconds)"""
+    calls = agent_steps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while calls < min_calls or elapsed < duration:
+        agent_steps += step()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls, agent_steps, elapsed
+
+
+def peak_memory(factory, size, seed, calls=3):
+    """Peak traced allocation (bytes) while building the benchmark and running a few steps"""
+    tracemalloc.start()
+    try:
+        step = factory(size, seed)
+        for _ in range(calls):
+            step()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(name, size, seed=0, duration=1.0):
+    """Run one benchmark at one population size; returns its metrics dict"""
+    factory = BENCHMARKS[name]
+    with contextlib.redirect_stdout(io.StringIO()):
+        calls, agent_steps, elapsed = time_steps(factory(size, seed), duration)
+        peak = peak_memory(factory, size, seed)
+
+    metrics = {
+        "calls_per_sec": calls / elapsed,
+        "agent_steps_per_sec": agent_steps / elapsed,
+        "peak_memory_mb": peak / 2**20,
+    }
+    if name == "frame":
+        metrics["frames_per_sec"] = calls / elapsed
+    if name == "new_generation":
+        metrics["generations_per_min"] = calls * 60 / elapsed
+    return metrics
+
+
+def run_suite(names=None, sizes=DEFAULT_SIZES, seed=0, duration=1.0):
+    """Run every (benchmark, size) pair; results are keyed "name/size" """
+    results = {}
+    for name in names or BENCHMARKS:
+        for size in sizes:
+            metrics = run_benchmark(name, size, seed, duration)
+            results[f"{name}/{size}"] = metrics
+            print(f"{name:>16} N={size:<7} {metrics['agent_steps_per_sec']:>14,.0f} agent-steps/s "
+                  f"{metrics['calls_per_sec']:>12,.1f} calls/s {metrics['peak_memory_mb']:>9.1f} MB")
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Regressions against a baseline: throughput below, or memory above, tolerance"""
+    regressions = []
+    for key, metrics in results.items():
+        if key not in baseline:
+            continue
+        expected = baseline[key]
+        rate, baseline_rate = metrics["agent_steps_per_sec"], expected["agent_steps_per_sec"]
+        if rate < baseline_rate * (1 - tolerance):
+            regressions.append(f"{key}: {rate:,.0f} agent-steps/s vs baseline {baseline_rate:,.0f}")
+        memory, baseline_memory = metrics["peak_memory_mb"], expected["peak_memory_mb"]
+        if memory > baseline_memory * (1 + tolerance):
+            regressions.append(f"{key}: {memory:.1f} MB peak vs baseline {baseline_memory:.1f} MB")
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Temple Run AI throughput benchmarks")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="population sizes to benchmark")
+    parser.add_argument("--duration", type=float, default=1.0,
+                        help="seconds to time each benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", metavar="JSON", default=None,
+                        help="fail if results regress against this baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed relative slowdown / memory growth against the baseline")
+    parser.add_argument("--save", metavar="JSON", default=None,
+                        help="write the results to this file (e.g. as a new baseline)")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_suite(args.benchmarks, args.sizes, args.seed, args.duration)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
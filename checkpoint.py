@@ -0,0 +1,145 @@
+import os
+import queue
+import threading
+import numpy as np
+from model import PopulationBrain
+from population import Population
+
+# A checkpoint is one uncompressed .npz holding an evaluated generation:
+# float32 genomes, per-agent stats, fitness, diversity stats, the generation
+# number and the run's base seed. Every later RNG stream is derived from
+# (seed, generation) (see seeding.py), so that is the complete RNG state.
+# The evolution strategy's name and its state from before it bred from this
+# generation are stored too, as "strategy" and "strategy_<field>" arrays.
+CHECKPOINT_VERSION = 1
+CHECKPOINT_NAME = "checkpoint.npz"
+_AGENT_FIELDS = ("score", "fitness", "survival_time", "moves_made", "obstacle_avoided", "parents")
+
+
+def checkpoint_arrays(population, generation, seed, strategy="ga", strategy_state=None):
+    """Snapshot an evaluated Population into a dict of arrays (copies, safe to write later)"""
+    brain = population.brain
+    arrays = {
+        "version": np.array(CHECKPOINT_VERSION),
+        "generation": np.array(generation),
+        "seed": np.array(seed, dtype=np.uint64),
+        "layers": np.array([brain.input_nodes, brain.hidden_nodes, brain.output_nodes]),
+        "genomes": brain.genomes().copy(),
+        "strategy": np.array(strategy),
+    }
+    for field, value in (strategy_state or {}).items():
+        arrays[f"strategy_{field}"] = np.array(value)
+    for field in _AGENT_FIELDS:
+        arrays[field] = getattr(population, field).copy()
+    stats = population.diversity_stats
+    if stats is not None:
+        arrays["diversity"] = np.array(stats["diversity"])
+        arrays["mean_l1"] = np.array(stats["mean_l1"])
+        arrays["gene_variance"] = np.asarray(stats["gene_variance"]).copy()
+        arrays["clusters"] = np.array(stats["clusters"])
+    return arrays
+
+
+def write_checkpoint(path, arrays):
+    """Write arrays to path atomically: a crash leaves either the old or the new file"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(path, population, generation, seed, strategy="ga", strategy_state=None):
+    write_checkpoint(path, checkpoint_arrays(population, generation, seed, strategy, strategy_state))
+
+
+def load_checkpoint(path):
+    """Rebuild an evaluated Population from a checkpoint.
+
+    Returns a dict with population, generation, seed, strategy (its name)
+    and strategy_state (see generation.STRATEGIES). The population is
+    built in bulk from the genome matrix; Player views and NeuralNetworks
+    are available through Player(population=..., index=i) and
+    population.brain.network(i).
+    """
+    with np.load(path) as data:
+        if int(data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} checkpoint")
+        input_nodes, hidden_nodes, output_nodes = (int(n) for n in data["layers"])
+        population = Population(PopulationBrain.from_genomes(data["genomes"], input_nodes,
+                                                             hidden_nodes, output_nodes))
+        for field in _AGENT_FIELDS:
+            getattr(population, field)[:] = data[field]
+        if "diversity" in data:
+            population.diversity_stats = {
+                "diversity": float(data["diversity"]),
+                "mean_l1": float(data["mean_l1"]),
+                "gene_variance": data["gene_variance"],
+                "clusters": int(data["clusters"]),
+            }
+        generation = int(data["generation"])
+        seed = int(data["seed"])
+        strategy = str(data["strategy"]) if "strategy" in data else "ga"  # Written before strategies existed
+        strategy_state = {name[len("strategy_"):]: data[name] for name in data.files
+                          if name.startswith("strategy_")}
+
+    population.alive[:] = False
+    population.alive_count = 0
+    population.best_index = int(np.argmax(population.score))
+    return {"population": population, "generation": generation, "seed": seed,
+            "strategy": strategy, "strategy_state": strategy_state}
+
+
+class AsyncCheckpointer:
+    """Writes checkpoints on a background thread so training never waits on disk.
+
+    submit() only copies the population's arrays; the file is written (and
+    atomically renamed into place) by the writer thread. Snapshots that
+    arrive while a write is in progress replace each other, so only the most
+    recent one is written next. Write errors are re-raised by the next
+    submit() or by close().
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, CHECKPOINT_NAME)
+        os.makedirs(directory, exist_ok=True)
+        self._pending = queue.Queue(maxsize=1)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, population, generation, seed, strategy="ga", strategy_state=None):
+        self._raise_error()
+        arrays = checkpoint_arrays(population, generation, seed, strategy, strategy_state)
+        while True:
+            try:
+                self._pending.put_nowait(arrays)
+                return
+            except queue.Full:
+                # Drop the stale snapshot that has not been picked up yet
+                try:
+                    self._pending.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def close(self):
+        """Write any pending checkpoint and stop the writer thread"""
+        self._pending.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def _run(self):
+        while True:
+            arrays = self._pending.get()
+            if arrays is None:
+                return
+            try:
+                write_checkpoint(self.path, arrays)
+            except OSError as error:
+                self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -37,4 +37,12 @@ DIFFICULTY_LEVELS = [
     {"threshold": 800, "speed": 20, "multiplier": 3, "spawn_mod": 15}
 ]
 
-POPULATION_SIZE = 1000
\ No newline at end of file
+# Neural network configuration
+INPUT_NODES = 8
+HIDDEN_NODES = 8
+OUTPUT_NODES = 3
+
+POPULATION_SIZE = 1000
+
+# Evaluation limits
+MAX_EPISODE_FRAMES = 20000  # Episodes are cut off here so a generation always ends
\ No newline at end of file
@@ -0,0 +1,250 @@
+import random
+import numpy as np
+import constants
+from game_state import OBSTACLE_SPAWN_Y, OBSTACLE_CULL_Y
+from sensors import observations_from_ahead
+
+ENV_OBSTACLE_CAPACITY = 16  # Obstacle slots per environment, grows if ever exceeded
+
+_THRESHOLDS = np.array([level["threshold"] for level in constants.DIFFICULTY_LEVELS])
+_SPEEDS = np.array([level["speed"] for level in constants.DIFFICULTY_LEVELS])
+_SPAWN_MODS = np.array([level["spawn_mod"] for level in constants.DIFFICULTY_LEVELS])
+
+# _LANE_OVERLAP[player_lane, obstacle_lane]: whether the two rects can overlap horizontally
+_PLAYER_LEFT = np.array(constants.LANE_X) - constants.PLAYER_WIDTH // 2
+_OBSTACLE_LEFT = np.array(constants.LANE_X) - constants.OBSTACLE_WIDTH // 2
+_LANE_OVERLAP = ((_PLAYER_LEFT[:, None] < _OBSTACLE_LEFT[None, :] + constants.OBSTACLE_WIDTH) &
+                 (_OBSTACLE_LEFT[None, :] < _PLAYER_LEFT[:, None] + constants.PLAYER_WIDTH))
+
+
+class VectorGameState:
+    """E independent obstacle streams advanced in lockstep as NumPy arrays.
+
+    Environment e follows exactly the same rules (and, given the same seed,
+    the same obstacle lanes) as a GameState(seeds[e]): spawn timer,
+    obstacle positions and difficulty tier are all tracked per environment.
+    """
+    def __init__(self, seeds):
+        self.num_envs = len(seeds)
+        self.seeds = list(seeds)
+        self.rngs = [random.Random(seed) for seed in self.seeds]
+        shape = (self.num_envs, ENV_OBSTACLE_CAPACITY)
+        self.obstacle_lane = np.zeros(shape, dtype=np.int64)
+        self.obstacle_y = np.zeros(shape, dtype=np.int64)
+        self.obstacle_active = np.zeros(shape, dtype=bool)
+        self.obstacle_counted = np.zeros(shape, dtype=bool)
+        self.spawn_timer = np.zeros(self.num_envs, dtype=np.int64)
+        self.tier = np.zeros(self.num_envs, dtype=np.int64)
+
+    def closest_ahead_y(self):
+        """(E, NUM_LANES) y of the closest obstacle above the player per lane (-inf if none)"""
+        ahead = self.obstacle_active & (self.obstacle_y < constants.PLAYER_Y)
+        ahead_y = np.where(ahead, self.obstacle_y, -np.inf)
+        closest = np.empty((self.num_envs, constants.NUM_LANES))
+        for lane in range(constants.NUM_LANES):
+            closest[:, lane] = np.where(self.obstacle_lane == lane, ahead_y, -np.inf).max(axis=1)
+        return closest
+
+    def lane_observations(self):
+        """(E, NUM_LANES, 8) observations, one per environment and player lane"""
+        return observations_from_ahead(self.closest_ahead_y())
+
+    def lane_collisions(self):
+        """(E, NUM_LANES) mask of lanes where a player overlaps an obstacle"""
+        overlap_y = (self.obstacle_active &
+                     (self.obstacle_y < constants.PLAYER_Y + constants.PLAYER_HEIGHT) &
+                     (constants.PLAYER_Y < self.obstacle_y + constants.OBSTACLE_HEIGHT))
+        hits = np.empty((self.num_envs, constants.NUM_LANES), dtype=bool)
+        for lane in range(constants.NUM_LANES):
+            hits[:, lane] = (overlap_y & _LANE_OVERLAP[lane][self.obstacle_lane]).any(axis=1)
+        return hits
+
+    def update(self, leader_score, running):
+        """Advance obstacles one frame in the running environments.
+
+        Difficulty of each environment follows its leader's score. Returns the
+        number of obstacles each environment's leader is credited with avoiding.
+        """
+        self.tier = np.searchsorted(_THRESHOLDS, leader_score, side="right") - 1
+        speed = np.where(running, _SPEEDS[self.tier], 0)
+
+        passed = (self.obstacle_active & ~self.obstacle_counted &
+                  (self.obstacle_y > constants.PLAYER_Y + constants.PLAYER_HEIGHT) & running[:, None])
+        self.obstacle_counted |= passed
+        avoided = passed.sum(axis=1)
+
+        self.spawn_timer += np.where(running, _SPAWN_MODS[self.tier], 0)
+        for env in np.flatnonzero(self.spawn_timer > constants.SPAWN_TIMER_BASE):
+            self._spawn(env, self.rngs[env].randint(0, constants.NUM_LANES - 1))
+            self.spawn_timer[env] = 0
+
+        self.obstacle_y += speed[:, None]
+        self.obstacle_active &= self.obstacle_y < OBSTACLE_CULL_Y
+        return avoided
+
+    def _spawn(self, env, lane):
+        free = np.flatnonzero(~self.obstacle_active[env])
+        if not len(free):
+            self._grow()
+            free = np.flatnonzero(~self.obstacle_active[env])
+        slot = free[0]
+        self.obstacle_lane[env, slot] = lane
+        self.obstacle_y[env, slot] = OBSTACLE_SPAWN_Y
+        self.obstacle_active[env, slot] = True
+        self.obstacle_counted[env, slot] = False
+
+    def _grow(self):
+        capacity = self.obstacle_y.shape[1]
+        for name in ("obstacle_lane", "obstacle_y", "obstacle_active", "obstacle_counted"):
+            old = getattr(self, name)
+            new = np.zeros((self.num_envs, capacity * 2), dtype=old.dtype)
+            new[:, :capacity] = old
+            setattr(self, name, new)
+
+
+def lane_action_table(tensors, observations):
+    """Action of every agent for every distinct observation, shape (N, E, NUM_LANES).
+
+    tensors come from action_table_tensors. With only E * NUM_LANES distinct
+    observations per frame, the first layer (bias folded in) for all agents
+    is a single (N * hidden, in + 1) x (in + 1, E * NUM_LANES) product.
+    """
+    input_layer, weights_hidden_output, biases_output = tensors
+    size, hidden_nodes = weights_hidden_output.shape[0], weights_hidden_output.shape[2]
+    num_envs = observations.shape[0]
+    columns = np.ones((input_layer.shape[1], num_envs * constants.NUM_LANES), dtype=input_layer.dtype)
+    columns[:-1] = observations.reshape(-1, input_layer.shape[1] - 1).T
+    # tanh saturates exactly, so the overflow clip of NeuralNetwork.tanh is not needed here
+    hidden = np.tanh(input_layer @ columns).reshape(size, hidden_nodes, -1)
+    raw_output = np.matmul(weights_hidden_output, hidden) + biases_output[:, :, None]
+    return first_argmax(raw_output).reshape(size, num_envs, constants.NUM_LANES)
+
+
+def action_table_tensors(brain, rows):
+    """Layer tensors of the given agents in the form lane_action_table expects"""
+    weights_input_hidden = brain.weights_input_hidden[rows]
+    input_layer = np.concatenate([weights_input_hidden, brain.biases_hidden[rows][:, :, None]], axis=2)
+    return (input_layer.reshape(-1, brain.input_nodes + 1),
+            brain.weights_hidden_output[rows], brain.biases_output[rows])
+
+
+def first_argmax(raw_output):
+    """np.argmax over axis 1 (ties go to the first output), unrolled for speed"""
+    actions = np.zeros(raw_output.shape[:1] + raw_output.shape[2:], dtype=np.int64)
+    best = raw_output[:, 0]
+    for output in range(1, raw_output.shape[1]):
+        better = raw_output[:, output] > best
+        actions[better] = output
+        best = np.where(better, raw_output[:, output], best)
+    return actions
+
+
+def simulate_environments(brain, seeds, max_frames=None):
+    """Evaluate every agent of a PopulationBrain in every seeded environment at once.
+
+    Returns per-agent stats of shape (E, N): score, survival_time,
+    obstacle_avoided and moves_made, plus max_tier of shape (E,): the highest
+    difficulty tier each environment reached. Clones are simulated once (see
+    expand_clone_stats).
+    """
+    first_rows, inverse, distinct = brain.distinct()
+    if distinct is not None:
+        return expand_clone_stats(simulate_distinct(distinct, seeds, max_frames), first_rows, inverse)
+    return simulate_distinct(brain, seeds, max_frames)
+
+
+def expand_clone_stats(stats, first_rows, inverse):
+    """Fan stats of the distinct genomes back out to every agent, exactly.
+
+    Clones move and die together, so survival and moves are shared. The
+    leader is always the first alive agent among those with the top score,
+    which is the first row of its genome, so only first rows are ever
+    credited with avoided obstacles; the other clones score survival // 10.
+    """
+    expanded = {field: values[:, inverse] for field, values in stats.items() if field != "max_tier"}
+    expanded["max_tier"] = stats["max_tier"]
+    clones = np.ones(len(inverse), dtype=bool)
+    clones[first_rows] = False
+    expanded["obstacle_avoided"][:, clones] = 0
+    expanded["score"][:, clones] = expanded["survival_time"][:, clones] // 10
+    return expanded
+
+
+def simulate_distinct(brain, seeds, max_frames=None):
+    """simulate_environments for a brain whose genomes are all distinct"""
+    envs = VectorGameState(seeds)
+    shape = (envs.num_envs, brain.size)
+    lane = np.ones(shape, dtype=np.int64)
+    alive = np.ones(shape, dtype=bool)
+    score = np.zeros(shape, dtype=np.int64)
+    survival_time = np.zeros(shape, dtype=np.int64)
+    moves_made = np.zeros(shape, dtype=np.int64)
+    obstacle_avoided = np.zeros(shape, dtype=np.int64)
+    env_index = np.arange(envs.num_envs)
+    best = np.zeros(envs.num_envs, dtype=np.int64)
+    max_tier = np.zeros(envs.num_envs, dtype=np.int64)
+
+    # Inference only runs for agents still alive in some environment; the
+    # compacted tensors are re-gathered once that set has shrunk by a quarter
+    rows = np.arange(brain.size)
+    row_of_agent = np.arange(brain.size)
+    tensors = action_table_tensors(brain, rows)
+
+    frames = 0
+    while alive.any() and (max_frames is None or frames < max_frames):
+        running = alive.any(axis=1)
+
+        # Sense once per (environment, lane); an agent's state only depends on its lane
+        observations = envs.lane_observations().astype(brain.genome_matrix.dtype)
+        alive_agents = np.flatnonzero(alive.any(axis=0))
+        if len(alive_agents) < 0.75 * len(rows):
+            rows = alive_agents
+            row_of_agent[:] = 0
+            row_of_agent[rows] = np.arange(len(rows))
+            tensors = action_table_tensors(brain, rows)
+        # Agents dead everywhere read row 0; their actions are masked out below
+        actions = lane_action_table(tensors, observations)[row_of_agent, env_index[:, None], lane]
+
+        new_lane = lane + (actions - 1)
+        moved = alive & (new_lane != lane) & (new_lane >= 0) & (new_lane < constants.NUM_LANES)
+        lane[moved] = new_lane[moved]
+        moves_made += moved
+
+        survival_time += alive
+        np.copyto(score, survival_time // 10 + obstacle_avoided * 10, where=alive)
+
+        # Leader (first alive agent with the highest score) drives each environment's difficulty
+        best = np.argmax(np.where(alive, score, -1), axis=1)
+        avoided = envs.update(score[env_index, best], running)
+        obstacle_avoided[env_index, best] += avoided
+        np.maximum(max_tier, envs.tier, out=max_tier)
+
+        hits = envs.lane_collisions()[env_index[:, None], lane]
+        alive &= ~hits
+        frames += 1
+
+    return {
+        "score": score,
+        "survival_time": survival_time,
+        "obstacle_avoided": obstacle_avoided,
+        "moves_made": moves_made,
+        "max_tier": max_tier,
+    }
+
+
+def evaluate_environments(population, seeds, max_frames=None):
+    """Score a Population by its mean stats over several seeded environments"""
+    stats = simulate_environments(population.brain, seeds, max_frames)
+    set_mean_stats(population, {field: values.mean(axis=0) for field, values in stats.items()
+                                if field != "max_tier"})
+    population.max_tier = int(stats["max_tier"].max())
+    return stats
+
+
+def set_mean_stats(population, mean_stats):
+    """Store per-agent mean stats (rounded) and mark the Population as fully evaluated"""
+    for field, values in mean_stats.items():
+        getattr(population, field)[:] = np.rint(values)
+    population.alive[:] = False
+    population.alive_count = 0
+    population.best_index = int(np.argmax(population.score))
@@ -0,0 +1,97 @@
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import constants
+from game_state import GameState
+from model import PopulationBrain
+from population import Population
+from simulation import simulate_episode
+from environments import evaluate_environments
+from seeding import environment_seeds
+
+# Per-agent statistics returned by the workers (and consumed by calculate_fitness)
+STAT_FIELDS = ("score", "survival_time", "obstacle_avoided", "moves_made")
+
+
+def evaluate_shard(shm_name, shape, dtype, start, stop, seed, max_frames=None, environments=1):
+    """Worker: simulate genomes[start:stop] from shared memory on seeded environments"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        genomes = np.ndarray(shape, dtype=dtype, buffer=shm.buf)[start:stop].copy()
+    finally:
+        shm.close()
+
+    population = Population(PopulationBrain(genomes, constants.INPUT_NODES,
+                                            constants.HIDDEN_NODES, constants.OUTPUT_NODES))
+    if environments > 1:
+        evaluate_environments(population, environment_seeds(seed, environments), max_frames)
+    else:
+        simulate_episode(GameState(seed), population, max_frames)
+    stats = {field: getattr(population, field) for field in STAT_FIELDS}
+    stats["max_tier"] = population.max_tier
+    return start, stop, stats
+
+
+class ParallelEvaluator:
+    """Evaluate a Population across a process pool.
+
+    The population is split into one shard per worker. Genomes are shipped
+    through a shared memory block instead of being pickled, and each worker
+    runs its own copy of the simulation seeded identically, so every shard
+    faces the same obstacle lanes. Difficulty follows each shard's own
+    leader, as it would in a population of that shard's size.
+    """
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(self.workers)
+        self._shm = None
+
+    def _shared_genomes(self, genomes):
+        """Copy genomes into the (reused) shared memory block"""
+        if self._shm is None or self._shm.size < genomes.nbytes:
+            self._release()
+            self._shm = shared_memory.SharedMemory(create=True, size=genomes.nbytes)
+        shared = np.ndarray(genomes.shape, dtype=genomes.dtype, buffer=self._shm.buf)
+        shared[:] = genomes
+        del shared
+
+    def evaluate(self, population, seed=None, max_frames=None, environments=1):
+        """Fill population's per-agent stats by simulating all shards in parallel.
+
+        With environments > 1 each shard is scored by its mean over that many
+        seeded environments (see environments.evaluate_environments).
+        """
+        if seed is None:
+            seed = int(np.random.randint(2**31))
+        genomes = population.brain.genomes()
+        self._shared_genomes(genomes)
+
+        bounds = np.linspace(0, population.size, min(self.workers, population.size) + 1).astype(int)
+        futures = [
+            self.executor.submit(evaluate_shard, self._shm.name, genomes.shape, genomes.dtype.str,
+                                 int(start), int(stop), seed, max_frames, environments)
+            for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start
+        ]
+        population.max_tier = 0
+        for future in futures:
+            start, stop, stats = future.result()
+            for field in STAT_FIELDS:
+                getattr(population, field)[start:stop] = stats[field]
+            population.max_tier = max(population.max_tier, stats["max_tier"])
+
+        population.alive[:] = False
+        population.alive_count = 0
+        population.best_index = int(np.argmax(population.score))
+        return population
+
+    def _release(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        self.executor.shutdown()
+        self._release()
+
@@ -1,63 +1,198 @@
 import random
-import pygame
+import numpy as np
 import constants
 
+# Horizontal extent of the player rect in each lane (players differ only by lane)
+_PLAYER_LEFT = np.array(constants.LANE_X) - constants.PLAYER_WIDTH // 2
+_PLAYER_RIGHT = _PLAYER_LEFT + constants.PLAYER_WIDTH
+_LANE_X = np.array(constants.LANE_X)
+
+OBSTACLE_CAPACITY = 64  # Initial ring buffer size, grows if ever exceeded
+OBSTACLE_SPAWN_Y = -50
+OBSTACLE_CULL_Y = 650
+
 class GameState:
-    def __init__(self):
+    """Game state with obstacles stored as preallocated struct-of-arrays.
+
+    Obstacles live in a ring buffer (lane, y, counted) ordered oldest first.
+    Every obstacle moves at the same speed, so age order is also y order:
+    culling pops from the head, and each lane keeps its own ring of slots with
+    a cursor to the first obstacle still ahead of the player.
+    """
+    def __init__(self, seed=None):
+        # Own RNG stream so a seeded game state replays the same obstacle lanes
+        self.rng = random.Random(seed)
+        self.obstacle_lane = np.zeros(OBSTACLE_CAPACITY, dtype=np.int64)
+        self.obstacle_y = np.zeros(OBSTACLE_CAPACITY, dtype=np.int64)
+        self.obstacle_counted = np.zeros(OBSTACLE_CAPACITY, dtype=bool)
+        self.lane_slots = np.zeros((constants.NUM_LANES, OBSTACLE_CAPACITY), dtype=np.int64)
         self.reset()
 
-    def reset(self):
-        self.obstacles = []
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.obstacle_head = 0
+        self.obstacle_count = 0
+        self.counted_count = 0  # Oldest obstacles already credited as avoided
+        self.lane_head = [0] * constants.NUM_LANES
+        self.lane_count = [0] * constants.NUM_LANES
+        self.lane_passed = [0] * constants.NUM_LANES
         self.obstacle_spawn_timer = 0
+        self.tier = 0
         self.running = True
-        
 
-    def get_difficulty_settings(self, player):
-        """Get current difficulty settings based on score"""
+    @property
+    def capacity(self):
+        return len(self.obstacle_y)
+
+    def active_slots(self):
+        """Ring buffer slots of live obstacles, oldest (lowest on screen) first"""
+        return (self.obstacle_head + np.arange(self.obstacle_count)) % self.capacity
+
+    def obstacle_positions(self):
+        """Return (lane, y) arrays of the live obstacles"""
+        slots = self.active_slots()
+        return self.obstacle_lane[slots], self.obstacle_y[slots]
+
+    def closest_ahead_y(self):
+        """y of the closest obstacle still above the player in each lane (-inf if none)"""
+        closest = np.full(constants.NUM_LANES, -np.inf)
+        for lane in range(constants.NUM_LANES):
+            if self.lane_passed[lane] < self.lane_count[lane]:
+                slot = self.lane_slots[lane, (self.lane_head[lane] + self.lane_passed[lane]) % self.capacity]
+                closest[lane] = self.obstacle_y[slot]
+        return closest
+
+    def spawn_obstacle(self, lane):
+        if self.obstacle_count == self.capacity:
+            self._grow()
+        slot = (self.obstacle_head + self.obstacle_count) % self.capacity
+        self.obstacle_lane[slot] = lane
+        self.obstacle_y[slot] = OBSTACLE_SPAWN_Y
+        self.obstacle_counted[slot] = False
+        self.obstacle_count += 1
+
+        self.lane_slots[lane, (self.lane_head[lane] + self.lane_count[lane]) % self.capacity] = slot
+        self.lane_count[lane] += 1
+
+    def move_obstacles(self, speed):
+        """Move every obstacle in place and drop the ones that left the screen"""
+        self.obstacle_y += speed
+        cap = self.capacity
+        # Advance each lane's cursor past obstacles that are no longer ahead
+        for lane in range(constants.NUM_LANES):
+            while (self.lane_passed[lane] < self.lane_count[lane] and
+                   self.obstacle_y[self.lane_slots[lane, (self.lane_head[lane] + self.lane_passed[lane]) % cap]]
+                   >= constants.PLAYER_Y):
+                self.lane_passed[lane] += 1
+
+        while self.obstacle_count and self.obstacle_y[self.obstacle_head] >= OBSTACLE_CULL_Y:
+            lane = int(self.obstacle_lane[self.obstacle_head])
+            if self.obstacle_counted[self.obstacle_head]:
+                self.counted_count -= 1
+            self.obstacle_head = (self.obstacle_head + 1) % cap
+            self.obstacle_count -= 1
+            # The oldest obstacle is also the oldest (and already passed) in its lane
+            self.lane_head[lane] = (self.lane_head[lane] + 1) % cap
+            self.lane_count[lane] -= 1
+            self.lane_passed[lane] -= 1
+
+    def count_avoided(self):
+        """Flag obstacles that fully passed the player; returns how many were new"""
+        avoided = 0
+        cap = self.capacity
+        while self.counted_count < self.obstacle_count:
+            slot = (self.obstacle_head + self.counted_count) % cap
+            if self.obstacle_y[slot] <= constants.PLAYER_Y + constants.PLAYER_HEIGHT:
+                break
+            self.obstacle_counted[slot] = True
+            self.counted_count += 1
+            avoided += 1
+        return avoided
+
+    def _grow(self):
+        """Double the ring buffers, unrolling live obstacles to the start"""
+        old_cap = self.capacity
+        slots = self.active_slots()
+        remap = np.zeros(old_cap, dtype=np.int64)
+        remap[slots] = np.arange(self.obstacle_count)
+        new_cap = old_cap * 2
+
+        for name in ("obstacle_lane", "obstacle_y", "obstacle_counted"):
+            old = getattr(self, name)
+            new = np.zeros(new_cap, dtype=old.dtype)
+            new[:self.obstacle_count] = old[slots]
+            setattr(self, name, new)
+
+        lane_slots = np.zeros((constants.NUM_LANES, new_cap), dtype=np.int64)
+        for lane in range(constants.NUM_LANES):
+            ring = (self.lane_head[lane] + np.arange(self.lane_count[lane])) % old_cap
+            lane_slots[lane, :self.lane_count[lane]] = remap[self.lane_slots[lane, ring]]
+        self.lane_slots = lane_slots
+        self.lane_head = [0] * constants.NUM_LANES
+        self.obstacle_head = 0
+
+    def get_difficulty_tier(self, player):
+        """Index into DIFFICULTY_LEVELS for the given player's score"""
         for i in range(len(constants.DIFFICULTY_LEVELS) - 1, -1, -1):
             if player.score >= constants.DIFFICULTY_LEVELS[i]["threshold"]:
-                return constants.DIFFICULTY_LEVELS[i]
-        return constants.DIFFICULTY_LEVELS[0]
+                return i
+        return 0
+
+    def get_difficulty_settings(self, player):
+        """Get current difficulty settings based on score"""
+        return constants.DIFFICULTY_LEVELS[self.get_difficulty_tier(player)]
 
 def check_collision(game_state, player):
-    """Optimized collision detection using pygame rects"""
-    player_rect = player.player_rect
-    for obstacle in game_state.obstacles:
-        obstacle_rect = pygame.Rect(
-            obstacle['x'] - constants.OBSTACLE_WIDTH // 2,
-            obstacle['y'], 
-            constants.OBSTACLE_WIDTH, 
-            constants.OBSTACLE_HEIGHT
-        )
-        if player_rect.colliderect(obstacle_rect):
-            return True
-    return False
+    """Collision test for a single player"""
+    return bool(lane_collisions(game_state)[player.player_lane])
+
+def lane_collisions(game_state):
+    """Test all obstacles against all lanes at once.
+
+    Returns a boolean array of shape (NUM_LANES,) that is True where a player
+    standing in that lane overlaps an obstacle (same rule as Rect.colliderect).
+    """
+    if not game_state.obstacle_count:
+        return np.zeros(constants.NUM_LANES, dtype=bool)
+    obstacle_lane, obstacle_y = game_state.obstacle_positions()
+    obstacle_left = _LANE_X[obstacle_lane] - constants.OBSTACLE_WIDTH // 2
+    obstacle_right = obstacle_left + constants.OBSTACLE_WIDTH
+
+    overlap_y = ((obstacle_y < constants.PLAYER_Y + constants.PLAYER_HEIGHT) &
+                 (constants.PLAYER_Y < obstacle_y + constants.OBSTACLE_HEIGHT))
+    overlap_x = ((_PLAYER_LEFT[:, None] < obstacle_right[None, :]) &
+                 (obstacle_left[None, :] < _PLAYER_RIGHT[:, None]))
+    return (overlap_x & overlap_y[None, :]).any(axis=1)
+
+def collision_mask(game_state, lanes):
+    """Death mask for all agents: one lane test per frame, then a gather by lane index"""
+    return lane_collisions(game_state)[lanes]
     
 def update_obstacles(game_state, player):
     """Optimized obstacle management"""
-    difficulty = game_state.get_difficulty_settings(player)
+    player.obstacle_avoided += advance_obstacles(game_state, game_state.get_difficulty_tier(player))
+
+def advance_obstacles(game_state, tier):
+    """Advance obstacles one frame at the given difficulty tier.
+
+    Returns the number of obstacles newly avoided. game_state.tier keeps the
+    tier used, so an episode can be replayed from its seed and tier sequence.
+    """
+    game_state.tier = tier
+    difficulty = constants.DIFFICULTY_LEVELS[tier]
     obstacle_speed = difficulty["speed"]
     
-    for obstacle in game_state.obstacles:
-        if obstacle['y'] > constants.PLAYER_Y + constants.PLAYER_HEIGHT and not obstacle.get('counted', False):
-            player.obstacle_avoided += 1
-            obstacle['counted'] = True
+    avoided = game_state.count_avoided()
     # Update obstacle spawn timer
     game_state.obstacle_spawn_timer += difficulty["spawn_mod"]
     
     # Spawn new obstacles
     if game_state.obstacle_spawn_timer > constants.SPAWN_TIMER_BASE:
-        random_lane = random.randint(0, constants.NUM_LANES - 1)
-        game_state.obstacles.append({
-            'x': constants.LANE_X[random_lane],
-            'y': -50,
-            'counted':False
-        })
+        random_lane = game_state.rng.randint(0, constants.NUM_LANES - 1)
+        game_state.spawn_obstacle(random_lane)
         game_state.obstacle_spawn_timer = 0
     
-    # Move obstacles and remove off-screen ones (single pass)
-    game_state.obstacles = [
-        {**obs, 'y': obs['y'] + obstacle_speed} 
-        for obs in game_state.obstacles 
-        if obs['y'] + obstacle_speed < 650
-    ]
\ No newline at end of file
+    # Move obstacles and remove off-screen ones (in place, no allocation)
+    game_state.move_obstacles(obstacle_speed)
+    return avoided
@@ -1,165 +1,435 @@
 import constants
-import random
 import numpy as np
-from model import NeuralNetwork
-from player import Player
+from model import GenomeArena, NeuralNetwork, PopulationBrain
+from population import Population
 
-def NewGeneration(saved_players):
+def NewGeneration(population, mutation_rate=0.01, temp=0.2, p_value=0.5, rng=None, population_size=None,
+                  elite_percentage=0.2, low_diversity_elite_percentage=0.4):
+    """Evolve a finished Population into the next generation's Population.
+
+    The selection distribution is built once, all parent pairs are drawn in
+    one call and crossover/mutation run on the whole offspring matrix.
+    rng is an optional np.random.Generator (see seeding.generation_rng);
+    population_size defaults to constants.POPULATION_SIZE. elite_percentage
+    of the population is carried over unchanged, or
+    low_diversity_elite_percentage once diversity drops to 0.3 or below.
+    """
+    rng = rng if rng is not None else np.random
+    population_size = population_size or constants.POPULATION_SIZE
     # Handle edge case where no players survived
-    if not saved_players:
+    if population is None or population.size == 0:
         print("No players survived! Creating new random population.")
-        new_players = []
-        for i in range(constants.POPULATION_SIZE):
-            new_players.append(Player())
-        return new_players
-    
-    players = calculate_fitness(saved_players)
-    
+        return Population.random(population_size, rng)
+
+    fitness = calculate_fitness(population)
+    genomes = population.brain.genomes()
+
     # Calculate population diversity for adaptive mutation
-    diversity = calculate_population_diversity(players)
-    print(f"Population diversity: {diversity:.3f}")
-    
-    players.sort(key=lambda p: p.fitness, reverse=True)
-    
+    diversity_stats = population_diversity_stats(genomes, rng)
+    population.diversity_stats = diversity_stats
+    diversity = diversity_stats["diversity"]
+
+    order = np.argsort(-fitness, kind="stable")
+
     # Dynamic elite percentage based on diversity
-    elite_percentage = 0.2 if diversity > 0.3 else 0.4  # More elites when low diversity
-    elite_count = max(1, int(constants.POPULATION_SIZE * elite_percentage))
-    elite = players[:elite_count]
-    
-    # Reset elite players for new generation
-    new_players = []
-    for elite_player in elite:
-        # Create new player with same brain but reset state
-        new_player = Player(elite_player.brain)
-        new_players.append(new_player)
-    
-    while len(new_players) < constants.POPULATION_SIZE:
-        parent1 = weighted_selection(players)
-        parent2 = weighted_selection(players)
-        # Crossover
-        child_brain = crossover(parent1.brain, parent2.brain)
-        child_brain.set_genome(mutate_genome(child_brain.get_genome(), generation_diversity=diversity))
-        new_players.append(Player(child_brain))
-        
-    return new_players
-
-def calculate_population_diversity(players):
-    """Calculate genetic diversity of the population"""
-    if len(players) < 2:
+    if diversity <= 0.3:
+        elite_percentage = low_diversity_elite_percentage  # More elites when low diversity
+    elite_count = min(max(1, int(population_size * elite_percentage)), population.size)
+    adaptive_rate, mutation_strength = adaptive_mutation(mutation_rate, diversity)
+    population.evolution_stats = {
+        "elite_count": elite_count,
+        "mutation_rate": adaptive_rate,
+        "mutation_strength": mutation_strength,
+    }
+
+    # Write the next generation into the arena's spare buffer (no per-generation allocation)
+    arena, next_genomes = next_genome_buffer(population.brain, population_size)
+
+    # Elite genomes are carried over unchanged; state is reset by the new Population
+    np.take(genomes, order[:elite_count], axis=0, out=next_genomes[:elite_count])
+
+    children = next_genomes[elite_count:]
+    parents = sample_parents(selection_distribution(fitness, temp, p_value), len(children), rng)
+    crossover_genomes(genomes[parents[:, 0]], genomes[parents[:, 1]], out=children, rng=rng)
+    mutate_genomes(children, mutation_rate, generation_diversity=diversity, rng=rng)
+
+    next_population = population_from_buffer(arena, next_genomes, population.brain)
+    # Elites keep a single parent (themselves); children record both crossover parents
+    next_population.parents[:elite_count, 0] = order[:elite_count]
+    next_population.parents[elite_count:] = parents
+    return next_population
+
+def next_genome_buffer(brain, population_size):
+    """(arena, buffer): where to write the next generation's genomes without allocating.
+
+    The buffer is the arena's spare one, or the active buffer of a new
+    arena when the population size changes.
+    """
+    arena = brain.arena
+    if arena is None or arena.size != population_size:
+        arena = GenomeArena(population_size, brain.genome_matrix.shape[1])
+        return arena, arena.active
+    return arena, arena.spare
+
+def population_from_buffer(arena, buffer, brain):
+    """New Population over a buffer filled after next_genome_buffer"""
+    if buffer is arena.spare:
+        arena.swap()
+    return Population(PopulationBrain.from_arena(arena, brain.input_nodes, brain.hidden_nodes,
+                                                 brain.output_nodes))
+
+def mean_pairwise_l1(genomes, block_size=16):
+    """Exact mean over all pairs of the mean absolute gene difference.
+
+    For one gene sorted ascending, sum_{i<j} |x_i - x_j| = sum_k x_k * (2k - N + 1),
+    so the whole population is covered in O(N log N) per gene. Genes are
+    processed in column blocks to bound the temporary memory.
+    """
+    n, genome_length = genomes.shape
+    if n < 2:
+        return 0.0
+    weights = 2.0 * np.arange(n) - (n - 1)
+    total = 0.0
+    for start in range(0, genome_length, block_size):
+        block = np.sort(genomes[:, start:start + block_size], axis=0).astype(np.float64)
+        total += weights @ block.sum(axis=1)
+    return total / (genome_length * n * (n - 1) / 2)
+
+def count_clusters(genomes, threshold=0.1, sample_size=1000, max_clusters=100, rng=None):
+    """Greedy leader clustering: agents within threshold mean-abs distance of a leader share a cluster.
+
+    Runs on a random sample of at most sample_size genomes and stops counting at max_clusters.
+    """
+    rng = rng if rng is not None else np.random
+    if len(genomes) > sample_size:
+        genomes = genomes[rng.choice(len(genomes), sample_size, replace=False)]
+    unassigned = np.ones(len(genomes), dtype=bool)
+    clusters = 0
+    while unassigned.any() and clusters < max_clusters:
+        leader = genomes[np.argmax(unassigned)]
+        candidates = np.flatnonzero(unassigned)
+        distance = np.abs(genomes[candidates] - leader).mean(axis=1)
+        unassigned[candidates[distance <= threshold]] = False
+        clusters += 1
+    return clusters
+
+def population_diversity_stats(genomes, rng=None):
+    """Diversity statistics of an (N, genome_length) genome matrix"""
+    mean_l1 = mean_pairwise_l1(genomes)
+    return {
+        "diversity": min(1.0, mean_l1) if len(genomes) >= 2 else 1.0,
+        "mean_l1": mean_l1,
+        "gene_variance": genomes.var(axis=0),
+        "clusters": count_clusters(genomes, rng=rng),
+    }
+
+def calculate_population_diversity(genomes):
+    """Calculate genetic diversity of an (N, genome_length) genome matrix"""
+    if len(genomes) < 2:
         return 1.0
-    
-    total_distance = 0
-    comparisons = 0
-    
-    # Sample subset for performance
-    sample_size = min(50, len(players))
-    sampled_players = random.sample(players, sample_size)
-    
-    for i in range(len(sampled_players)):
-        for j in range(i + 1, len(sampled_players)):
-            genome1 = sampled_players[i].brain.get_genome()
-            genome2 = sampled_players[j].brain.get_genome()
-            distance = np.mean(np.abs(genome1 - genome2))
-            total_distance += distance
-            comparisons += 1
-    
-    return min(1.0, total_distance / comparisons) if comparisons > 0 else 1.0
+    return min(1.0, mean_pairwise_l1(genomes))
+
+def crossover_genomes(genomes1, genomes2, out=None, rng=None):
+    """Uniform crossover of two equally shaped genome matrices (optionally into out)"""
+    rng = rng if rng is not None else np.random
+    mask = rng.random(genomes1.shape) < 0.5
+    if out is None:
+        return np.where(mask, genomes1, genomes2)
+    np.copyto(out, genomes2)
+    np.copyto(out, genomes1, where=mask)
+    return out
 
 def crossover(parent1_brain, parent2_brain):
     """Crossover between two parent brains to create a child brain"""
-    genome1 = parent1_brain.get_genome()
-    genome2 = parent2_brain.get_genome()
-
-    # Blend crossover: create child genome by blending parent genes
-    child_genome = np.zeros_like(genome1)
-    for i in range(len(genome1)):
-        if random.random() < 0.5:
-            child_genome[i] = genome1[i]
-        else:
-            child_genome[i] = genome2[i]
-    child_brain = NeuralNetwork(parent1_brain.input_nodes, parent1_brain.hidden_nodes, parent1_brain.output_nodes)
-    child_brain.set_genome(child_genome)
-    return child_brain
+    child_genome = crossover_genomes(parent1_brain.get_genome(), parent2_brain.get_genome())
+    return NeuralNetwork(parent1_brain.input_nodes, parent1_brain.hidden_nodes,
+                         parent1_brain.output_nodes, genome=child_genome)
 
-def mutate_genome(genome, mutation_rate=0.01, generation_diversity=1.0):
-    """Adaptive mutation based on population diversity"""
+def adaptive_mutation(mutation_rate, generation_diversity):
+    """(per-gene mutation probability, mutation std) adapted to population diversity"""
     # Increase mutation rate when diversity is low
     adaptive_rate = mutation_rate * (2.0 - generation_diversity)
-    
-    for i in range(len(genome)):
-        if random.random() < adaptive_rate:
-            # Gaussian mutation instead of uniform
-            mutation_strength = 0.1 if generation_diversity > 0.5 else 0.3
-            mutation_value = np.random.normal(0, mutation_strength)
-            genome[i] += mutation_value
-            # Clamp to reasonable bounds
-            genome[i] = np.clip(genome[i], -2.0, 2.0)
-    return genome
-
-def calculate_fitness(players):
-    
-    """Calculate fitness based on score and survival time"""
-    max_score = max((player.score for player in players), default=1)
-    max_obstacle_avoided = max((player.obstacle_avoided for player in players), default=1)
-    max_survival_time = max((player.survival_time for player in players), default=1)  
-    max_moves_made = max((player.moves_made for player in players), default=1)
-    
-    # Additional safety: ensure no zero divisions
-    max_score = max(max_score, 1)
-    max_obstacle_avoided = max(max_obstacle_avoided, 1)
-    max_survival_time = max(max_survival_time, 1)
-    max_moves_made = max(max_moves_made, 1)
-    for player in players:
-        # Streamlined fitness function - score already includes survival time and obstacles avoided
-        score_component = (player.score / max_score) * 0.8
-        
-        # Movement efficiency bonus (reward smart movement patterns)
-        if player.moves_made > 0:
-            move_efficiency = min(1.0, player.obstacle_avoided / player.moves_made)
-            efficiency_bonus = move_efficiency * 0.2
-        else:
-            # Small penalty for never moving (could be stuck)
-            efficiency_bonus = 0.1 if player.survival_time > 50 else 0.0
-        
-        # Combine components
-        player.fitness = (score_component + efficiency_bonus) ** 2
-
-    # Normalize fitness values
-    max_fitness = sum(player.fitness for player in players) if players else 1
-    for player in players:
-        player.fitness /= max_fitness
-    # Debug info
-    print(f"Generation stats - Max score: {max_score}, Max obstacles avoided: {max_obstacle_avoided}")
-    print(f"Best player fitness: {max(p.fitness for p in players)}")
-        
-    return players
+    mutation_strength = 0.1 if generation_diversity > 0.5 else 0.3
+    return adaptive_rate, mutation_strength
 
-def weighted_selection(players, temp=0.2, p_value=0.5):
-    """Select a player based on weighted probabilities with nucleus (top-p) sampling"""
-    total_fitness = sum(player.fitness for player in players)
-    if total_fitness == 0:
-        return random.choice(players)  # Avoid division by zero
+def mutate_genomes(genomes, mutation_rate=0.01, generation_diversity=1.0, rng=None):
+    """Adaptive Gaussian mutation of a genome (or genome matrix) in place, based on population diversity"""
+    adaptive_rate, mutation_strength = adaptive_mutation(mutation_rate, generation_diversity)
+
+    rng = rng if rng is not None else np.random
+    mask = rng.random(genomes.shape) < adaptive_rate
+    mutated = genomes[mask] + rng.normal(0, mutation_strength, np.count_nonzero(mask))
+    # Clamp to reasonable bounds
+    genomes[mask] = np.clip(mutated, -2.0, 2.0)
+    return genomes
 
-    probabilities = [player.fitness / total_fitness for player in players]
+def mutate_genome(genome, mutation_rate=0.01, generation_diversity=1.0):
+    """Adaptive mutation based on population diversity"""
+    return mutate_genomes(genome, mutation_rate, generation_diversity)
+
+def calculate_fitness(population):
+    """Calculate fitness based on score and survival time; returns the fitness array"""
+    max_score = max(int(population.score.max(initial=1)), 1)
+
+    # Streamlined fitness function - score already includes survival time and obstacles avoided
+    score_component = (population.score / max_score) * 0.8
+
+    # Movement efficiency bonus (reward smart movement patterns)
+    moved = population.moves_made > 0
+    move_efficiency = np.minimum(1.0, population.obstacle_avoided / np.maximum(population.moves_made, 1))
+    # Small penalty for never moving (could be stuck)
+    efficiency_bonus = np.where(moved, move_efficiency * 0.2,
+                                np.where(population.survival_time > 50, 0.1, 0.0))
+
+    # Combine components and normalize
+    fitness = (score_component + efficiency_bonus) ** 2
+    total_fitness = fitness.sum()
+    if total_fitness > 0:
+        fitness /= total_fitness
+    population.fitness[:] = fitness
+    return population.fitness
+
+def selection_distribution(fitness, temp=0.2, p_value=0.5):
+    """Build the nucleus (top-p) sampling distribution once per generation.
+
+    Returns (indices, probabilities); probabilities is None for uniform sampling.
+    """
+    indices = np.arange(len(fitness))
+    total_fitness = fitness.sum()
+    if total_fitness == 0:
+        return indices, None  # Avoid division by zero
 
     # Apply temperature scaling
-    scaled_probabilities = [p ** (1 / temp) for p in probabilities]
-    total_scaled = sum(scaled_probabilities)
+    scaled_probabilities = (fitness / total_fitness) ** (1 / temp)
+    total_scaled = scaled_probabilities.sum()
     if total_scaled == 0:
-        return random.choice(players)  # Avoid division by zero
-
-    scaled_probabilities = [p / total_scaled for p in scaled_probabilities]
+        return indices, None  # Avoid division by zero
+    scaled_probabilities /= total_scaled
 
     # Nucleus (top-p) sampling
     sorted_indices = np.argsort(scaled_probabilities)[::-1]
-    sorted_probs = np.array(scaled_probabilities)[sorted_indices]
+    sorted_probs = scaled_probabilities[sorted_indices]
     cumulative_probs = np.cumsum(sorted_probs)
     cutoff = np.searchsorted(cumulative_probs, p_value) + 1
 
-    # Select top-p players and normalize their probabilities
-    top_indices = sorted_indices[:cutoff]
+    # Keep top-p players and normalize their probabilities
     top_probs = sorted_probs[:cutoff]
-    top_probs /= top_probs.sum()
+    return sorted_indices[:cutoff], top_probs / top_probs.sum()
+
+def sample_parents(distribution, count, rng=None):
+    """Draw all (parent1, parent2) index pairs for a generation in one call"""
+    rng = rng if rng is not None else np.random
+    indices, probabilities = distribution
+    return rng.choice(indices, size=(count, 2), p=probabilities)
+
+def weighted_selection(players, temp=0.2, p_value=0.5):
+    """Select a player based on weighted probabilities with nucleus (top-p) sampling"""
+    fitness = np.array([player.fitness for player in players])
+    return players[sample_parents(selection_distribution(fitness, temp, p_value), 1)[0, 0]]
+
+def tie_average(values, fitness):
+    """values (given in descending fitness order) averaged over agents with equal fitness.
+
+    Agents in the coupled game often die on the same frame; averaging keeps
+    row order from deciding who among them counts as better.
+    """
+    order = np.argsort(-fitness, kind="stable")
+    _, group, counts = np.unique(-fitness[order], return_inverse=True, return_counts=True)
+    averaged = np.empty(len(fitness))
+    averaged[order] = (np.bincount(group, weights=values) / counts)[group]
+    return averaged
+
+def centered_ranks(fitness):
+    """Fitness ranks scaled to [-0.5, 0.5] (ties share their mean rank), so updates ignore the fitness scale"""
+    return tie_average(np.linspace(0.5, -0.5, len(fitness)), fitness)
+
+# Evolution strategies. Each one turns an evaluated Population into the next
+# one through next_generation(population, rng=None, population_size=None),
+# so main_game can swap them freely. The distribution-based strategies keep
+# their state between generations and sample whole populations as matrices;
+# state() / load_state() expose it as a dict of arrays for checkpoints.
+
+class GeneticAlgorithm:
+    """Nucleus-sampling GA with uniform crossover and adaptive mutation (NewGeneration)"""
+    name = "ga"
+
+    def __init__(self, mutation_rate=0.01, temp=0.2, p_value=0.5, elite_percentage=0.2,
+                 low_diversity_elite_percentage=0.4):
+        self.mutation_rate = mutation_rate
+        self.temp = temp
+        self.p_value = p_value
+        self.elite_percentage = elite_percentage
+        self.low_diversity_elite_percentage = low_diversity_elite_percentage
+
+    def next_generation(self, population, rng=None, population_size=None):
+        return NewGeneration(population, self.mutation_rate, self.temp, self.p_value, rng, population_size,
+                             self.elite_percentage, self.low_diversity_elite_percentage)
+
+    def state(self):
+        return {}  # Everything the GA needs is in the population
+
+    def load_state(self, state):
+        pass
+
+class CMAES:
+    """Covariance matrix adaptation evolution strategy over the flat genome.
+
+    The first population it sees (random, or loaded from a checkpoint) seeds
+    the search distribution. Row 0 of every generation is the distribution
+    mean; the other rows are drawn as mean + sigma * (z * D) @ B.T with
+    C = B diag(D**2) B.T. All rows are ranked by fitness and the better half
+    updates mean, step size and covariance (Hansen's standard update).
+    """
+    name = "cmaes"
+    _STATE_FIELDS = ("mean", "sigma", "covariance", "basis", "scales", "path_sigma", "path_c", "generations")
+
+    def __init__(self, sigma=None):
+        self.initial_sigma = sigma
+        self.mean = None
+        self.generations = 0
+
+    def state(self):
+        """Search distribution as a dict of arrays (empty before the first generation)"""
+        if self.mean is None:
+            return {}
+        return {field: np.array(getattr(self, field)) for field in self._STATE_FIELDS}
+
+    def load_state(self, state):
+        if not state:
+            return
+        for field in self._STATE_FIELDS:
+            setattr(self, field, np.array(state[field]))
+        self.sigma = float(self.sigma)
+        self.generations = int(self.generations)
+
+    def _start(self, genomes):
+        n = genomes.shape[1]
+        self.mean = genomes.mean(axis=0, dtype=np.float64)
+        self.sigma = self.initial_sigma or float(genomes.std(axis=0).mean()) or 0.5
+        self.covariance = np.eye(n)
+        self.basis = np.eye(n)
+        self.scales = np.ones(n)
+        self.path_sigma = np.zeros(n)
+        self.path_c = np.zeros(n)
+
+    def _update(self, genomes, fitness):
+        """Move the search distribution towards the better half of an evaluated generation"""
+        size, n = genomes.shape
+        mu = size // 2
+        weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mu_eff = 1 / np.sum(weights ** 2)
+
+        c_c = (4 + mu_eff / n) / (n + 4 + 2 * mu_eff / n)
+        c_s = (mu_eff + 2) / (n + mu_eff + 5)
+        c_1 = 2 / ((n + 1.3) ** 2 + mu_eff)
+        c_mu = min(1 - c_1, 2 * (mu_eff - 2 + 1 / mu_eff) / ((n + 2) ** 2 + mu_eff))
+        damping = 1 + 2 * max(0.0, np.sqrt((mu_eff - 1) / (n + 1)) - 1) + c_s
+        chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+
+        # Recombination weights by fitness rank; tied agents share their weights
+        weights = tie_average(np.concatenate([weights, np.zeros(size - mu)]), fitness)
+        selected = np.flatnonzero(weights)
+        weights = weights[selected]
+        steps = (genomes[selected] - self.mean) / self.sigma
+        step = weights @ steps
+        self.mean = self.mean + self.sigma * step
+
+        inverse_sqrt = (self.basis / self.scales) @ self.basis.T
+        self.path_sigma = (1 - c_s) * self.path_sigma + np.sqrt(c_s * (2 - c_s) * mu_eff) * (inverse_sqrt @ step)
+        self.generations += 1
+        path_norm = np.linalg.norm(self.path_sigma)
+        stalled = path_norm / np.sqrt(1 - (1 - c_s) ** (2 * self.generations)) / chi_n >= 1.4 + 2 / (n + 1)
+        self.path_c = (1 - c_c) * self.path_c + (not stalled) * np.sqrt(c_c * (2 - c_c) * mu_eff) * step
+
+        rank_one = np.outer(self.path_c, self.path_c) + stalled * c_c * (2 - c_c) * self.covariance
+        rank_mu = (steps.T * weights) @ steps
+        self.covariance = (1 - c_1 - c_mu) * self.covariance + c_1 * rank_one + c_mu * rank_mu
+        self.sigma *= np.exp((c_s / damping) * (path_norm / chi_n - 1))
+
+        self.covariance = (self.covariance + self.covariance.T) / 2
+        eigenvalues, self.basis = np.linalg.eigh(self.covariance)
+        self.scales = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+    def next_generation(self, population, rng=None, population_size=None):
+        rng = rng if rng is not None else np.random
+        population_size = population_size or constants.POPULATION_SIZE
+        genomes = population.brain.genomes()
+        fitness = calculate_fitness(population)
+        population.diversity_stats = population_diversity_stats(genomes, rng)
+
+        if self.mean is None:
+            self._start(genomes)
+        self._update(genomes, fitness)
+        population.evolution_stats = {"sigma": self.sigma,
+                                      "condition": float((self.scales.max() / self.scales.min()) ** 2)}
+
+        arena, next_genomes = next_genome_buffer(population.brain, population_size)
+        z = rng.standard_normal((population_size - 1, len(self.mean)))
+        next_genomes[0] = self.mean
+        next_genomes[1:] = self.mean + self.sigma * (z * self.scales) @ self.basis.T
+        return population_from_buffer(arena, next_genomes, population.brain)
+
+class NaturalES:
+    """Natural evolution strategy with antithetic sampling (OpenAI-ES).
+
+    Row 0 is the mean; the rest are mirrored pairs mean + sigma * eps and
+    mean - sigma * eps, so noise common to both halves cancels out of the
+    gradient estimate. Fitness is rank-shaped before the gradient step. The
+    first population it sees (random, or a checkpoint) only provides the
+    starting mean: its best genome.
+    """
+    name = "nes"
+
+    def __init__(self, sigma=1.0, learning_rate=1.0):
+        self.sigma = sigma
+        self.learning_rate = learning_rate
+        self.mean = None
+        self.noise = None
+
+    def state(self):
+        """Mean and the noise the current generation was sampled with (empty before the first one)"""
+        if self.mean is None:
+            return {}
+        return {"mean": self.mean.copy(), "noise": self.noise.copy()}
+
+    def load_state(self, state):
+        if state:
+            self.mean = np.array(state["mean"])
+            self.noise = np.array(state["noise"])
+
+    def next_generation(self, population, rng=None, population_size=None):
+        rng = rng if rng is not None else np.random
+        population_size = population_size or constants.POPULATION_SIZE
+        genomes = population.brain.genomes()
+        fitness = calculate_fitness(population)
+        population.diversity_stats = population_diversity_stats(genomes, rng)
+
+        pairs = len(self.noise) if self.noise is not None else 0
+        if self.mean is None or population.size < 1 + 2 * pairs:
+            self.mean = genomes[np.argmax(fitness)].astype(np.float64)
+            gradient_norm = 0.0
+        else:
+            utility = centered_ranks(fitness[1:1 + 2 * pairs])
+            gradient = (utility[:pairs] - utility[pairs:]) @ self.noise / (2 * pairs * self.sigma)
+            self.mean = self.mean + self.learning_rate * gradient
+            gradient_norm = float(np.linalg.norm(gradient))
+        population.evolution_stats = {"sigma": self.sigma, "gradient_norm": gradient_norm}
+
+        pairs = (population_size - 1) // 2
+        self.noise = rng.standard_normal((pairs, len(self.mean)))
+        arena, next_genomes = next_genome_buffer(population.brain, population_size)
+        next_genomes[:] = self.mean  # Row 0, and the spare last row when pairs don't fill the population
+        next_genomes[1:1 + pairs] += self.sigma * self.noise
+        next_genomes[1 + pairs:1 + 2 * pairs] -= self.sigma * self.noise
+        return population_from_buffer(arena, next_genomes, population.brain)
+
+STRATEGIES = {
+    "ga": GeneticAlgorithm,
+    "cmaes": CMAES,
+    "nes": NaturalES,
+}
 
-    selected_index = np.random.choice(top_indices, p=top_probs)
-    return players[selected_index]
\ No newline at end of file
+def make_strategy(name="ga", **settings):
+    """Strategy instance by name (see STRATEGIES)"""
+    return STRATEGIES[name](**settings)
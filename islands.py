@@ -0,0 +1,145 @@
+import multiprocessing
+import queue
+import time
+import numpy as np
+import constants
+import generation
+from game_state import GameState
+from population import Population
+from seeding import generation_rng, generation_seed, island_seed
+from simulation import evaluate_population
+from telemetry import generation_record, summary_line
+
+# Selection settings of each island (cycled when there are more islands),
+# so islands explore differently: the first uses NewGeneration's defaults.
+ISLAND_SETTINGS = [
+    {"temp": 0.2, "p_value": 0.5, "mutation_rate": 0.01},
+    {"temp": 0.1, "p_value": 0.3, "mutation_rate": 0.01},   # Greedier selection
+    {"temp": 0.4, "p_value": 0.7, "mutation_rate": 0.02},   # Broader selection, more mutation
+    {"temp": 0.2, "p_value": 0.9, "mutation_rate": 0.005},  # Wide nucleus, gentle mutation
+]
+
+
+def island_settings(island):
+    return ISLAND_SETTINGS[island % len(ISLAND_SETTINGS)]
+
+
+def latest_migrants(inbox):
+    """Most recent genome batch waiting in the inbox, or None; never blocks"""
+    migrants = None
+    while True:
+        try:
+            migrants = inbox.get_nowait()
+        except queue.Empty:
+            return migrants
+
+
+def island_worker(island, base_seed, size, generations, migration_interval, migrants, environments,
+                  max_frames, inbox, outbox, results):
+    """Evolve one island, exchanging its top genomes with its neighbours every migration_interval generations.
+
+    Emigrants are the island's fittest genomes; immigrants replace the last
+    (least promising) children of the next generation and are evaluated
+    there like any other agent. Receiving never waits, so islands only
+    share data, never a clock. Records (and finally the champion) go to results.
+    """
+    seed = island_seed(base_seed, island)
+    settings = island_settings(island)
+    population = Population.random(size, generation_rng(seed, 0))
+    game_state = GameState()
+    champion = None
+    run_start = time.perf_counter()
+
+    generation_number = 0
+    while generations is None or generation_number < generations:
+        generation_start = time.perf_counter()
+        evaluate_population(population, game_state, generation_seed(seed, generation_number), environments, max_frames)
+        next_population = generation.NewGeneration(population, rng=generation_rng(seed, generation_number + 1),
+                                                   population_size=size, **settings)
+
+        best = population.best_index
+        if champion is None or population.score[best] > champion["score"]:
+            champion = {"score": int(population.score[best]), "generation": generation_number,
+                        "genome": population.brain.genomes()[best].copy()}
+
+        if migrants and (generation_number + 1) % migration_interval == 0:
+            order = np.argsort(-population.fitness, kind="stable")
+            outbox.put(population.brain.genomes()[order[:migrants]].copy())
+            immigrants = latest_migrants(inbox)
+            if immigrants is not None:
+                count = min(len(immigrants), size - 1)
+                next_population.brain.genomes()[-count:] = immigrants[:count]
+                next_population.parents[-count:] = -1  # Not descended from this island
+
+        now = time.perf_counter()
+        record = generation_record(generation_number, population, now - generation_start, now - run_start,
+                                   environments)
+        record["island"] = island
+        results.put(record)
+        population = next_population
+        generation_number += 1
+
+    # Undelivered migrants are of no use once this island has finished
+    outbox.cancel_join_thread()
+    results.put({"island": island, "done": True, "champion": champion})
+
+
+def run_islands(islands, base_seed, generations=None, migration_interval=5, migrants=10, environments=1,
+                max_frames=constants.MAX_EPISODE_FRAMES, population_size=None, telemetry=None):
+    """Evolve islands sub-populations in parallel processes connected in a ring.
+
+    The population is split evenly; island i sends migrants to island i + 1
+    over multiprocessing queues. Per-generation records are printed (and
+    emitted to telemetry, tagged with their island). Returns the champion
+    of every island, best first.
+    """
+    if migration_interval < 1:
+        raise ValueError("migration_interval must be at least 1")
+    size = max(2, (population_size or constants.POPULATION_SIZE) // islands)
+    inboxes = [multiprocessing.Queue() for _ in range(islands)]
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=island_worker, name=f"island-{island}", daemon=True,
+            args=(island, base_seed, size, generations, migration_interval, migrants, environments,
+                  max_frames, inboxes[island], inboxes[(island + 1) % islands], results))
+        for island in range(islands)
+    ]
+    print(f"Island model: {islands} islands of {size} players, "
+          f"{migrants} migrants every {migration_interval} generations")
+    for process in processes:
+        process.start()
+
+    champions = {}
+    exited = {}  # Island -> time it was first seen exited without its done record
+    try:
+        while len(champions) < islands:
+            try:
+                record = results.get(timeout=1.0)
+            except queue.Empty:
+                record = {}
+            if record.get("done"):
+                champions[record["island"]] = record["champion"]
+            elif record:
+                print(f"Island {record['island']} {summary_line(record)}")
+                if telemetry is not None:
+                    telemetry.emit(record)
+            # A finished island's done record may still be in flight when it exits,
+            # so only one gone for a whole second without it has died
+            now = time.monotonic()
+            for island, process in enumerate(processes):
+                if island not in champions and process.exitcode is not None \
+                        and now - exited.setdefault(island, now) > 1.0:
+                    raise RuntimeError(f"island {island} exited with code {process.exitcode} before finishing")
+    finally:
+        for island, process in enumerate(processes):
+            if island not in champions:
+                process.terminate()  # Interrupted before this island finished
+            process.join()
+
+    ranked = sorted((dict(champion, island=island) for island, champion in champions.items()
+                     if champion is not None), key=lambda champion: -champion["score"])
+    if ranked:
+        best = ranked[0]
+        print(f"Best agent: island {best['island']}, generation {best['generation']}, score {best['score']}")
+    return ranked
@@ -0,0 +1,127 @@
+import os
+import struct
+import numpy as np
+from model import GENOME_DTYPE
+
+# Lineage history: an append-only records file plus a small index file.
+#   lineage.records: header, then one fixed-width record per agent per generation
+#   lineage.index:   one (generation, first record, record count) int64 row per generation
+# A generation's records are written before its index row, so a run killed
+# mid-append leaves only unindexed bytes, which the next writer truncates.
+LINEAGE_MAGIC = b"TLIN"
+LINEAGE_VERSION = 1
+RECORDS_NAME = "lineage.records"
+INDEX_NAME = "lineage.index"
+_HEADER = struct.Struct("<4sHI")  # magic, version, genome length
+INDEX_DTYPE = np.dtype([("generation", "<i8"), ("start", "<i8"), ("count", "<i8")])
+
+
+def record_dtype(genome_length):
+    """Fixed-width per-agent record; parents are rows in the previous generation (-1 if none)"""
+    return np.dtype([
+        ("genome", GENOME_DTYPE, (genome_length,)),
+        ("fitness", "<f8"),
+        ("score", "<i8"),
+        ("parents", "<i8", (2,)),
+    ])
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        magic, version, genome_length = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != LINEAGE_MAGIC or version != LINEAGE_VERSION:
+        raise ValueError(f"{path} is not a version {LINEAGE_VERSION} lineage file")
+    return genome_length
+
+
+class LineageWriter:
+    """Appends each evaluated generation of a run to a lineage directory.
+
+    A resumed run (resume=True) continues an existing directory; generations
+    at or after start_generation (e.g. ones evolved after the checkpoint
+    being resumed) are dropped first so the history stays consistent. A
+    fresh run refuses a directory that already holds history.
+    """
+    def __init__(self, directory, genome_length, start_generation=0, resume=False):
+        os.makedirs(directory, exist_ok=True)
+        self.records_path = os.path.join(directory, RECORDS_NAME)
+        self.index_path = os.path.join(directory, INDEX_NAME)
+        self.dtype = record_dtype(genome_length)
+
+        if not os.path.exists(self.records_path):
+            with open(self.records_path, "wb") as f:
+                f.write(_HEADER.pack(LINEAGE_MAGIC, LINEAGE_VERSION, genome_length))
+            open(self.index_path, "wb").close()
+        elif _read_header(self.records_path) != genome_length:
+            raise ValueError(f"{self.records_path} holds genomes of a different length")
+
+        index = np.fromfile(self.index_path, dtype=INDEX_DTYPE)
+        if not resume and len(index):
+            raise ValueError(f"{directory} already holds a lineage; resume its run or use a new directory")
+        index = index[index["generation"] < start_generation]
+        index.tofile(self.index_path)
+        self.next_record = int(index["start"][-1] + index["count"][-1]) if len(index) else 0
+        with open(self.records_path, "r+b") as f:
+            f.truncate(_HEADER.size + self.next_record * self.dtype.itemsize)
+
+    def append(self, generation, population):
+        """Write every agent of an evaluated Population as one generation"""
+        records = np.empty(population.size, dtype=self.dtype)
+        records["genome"] = population.brain.genomes()
+        records["fitness"] = population.fitness
+        records["score"] = population.score
+        records["parents"] = population.parents
+        with open(self.records_path, "ab") as f:
+            records.tofile(f)
+        with open(self.index_path, "ab") as f:
+            np.array([(generation, self.next_record, population.size)], dtype=INDEX_DTYPE).tofile(f)
+        self.next_record += population.size
+
+
+class LineageStore:
+    """Read-only, memory-mapped view of a lineage directory.
+
+    Only the pages that are actually touched get read, so single agents or
+    ancestries can be queried from histories far larger than RAM.
+    """
+    def __init__(self, directory):
+        records_path = os.path.join(directory, RECORDS_NAME)
+        self.genome_length = _read_header(records_path)
+        self.index = np.fromfile(os.path.join(directory, INDEX_NAME), dtype=INDEX_DTYPE)
+        count = int(self.index["start"][-1] + self.index["count"][-1]) if len(self.index) else 0
+        self.records = np.memmap(records_path, dtype=record_dtype(self.genome_length), mode="r",
+                                 offset=_HEADER.size, shape=(count,))
+        self._rows = {int(row["generation"]): row for row in self.index}
+
+    def generations(self):
+        """Recorded generation numbers in order"""
+        return self.index["generation"].tolist()
+
+    def generation(self, number):
+        """Memory-mapped records of one generation"""
+        row = self._rows[number]
+        return self.records[row["start"]:row["start"] + row["count"]]
+
+    def champion(self, number):
+        """(agent row, record) of the highest-fitness agent of a generation"""
+        records = self.generation(number)
+        agent = int(np.argmax(records["fitness"]))
+        return agent, records[agent]
+
+    def ancestry(self, number, agent, depth=None):
+        """Ancestors of one agent, as {generation: sorted agent rows}, going back depth generations.
+
+        Stops at the first generation whose parents were not recorded
+        (a random initial population, or the start of the history).
+        """
+        oldest = number - depth if depth is not None else None
+        ancestors = {number: np.array([agent])}
+        rows = ancestors[number]
+        while number - 1 in self._rows and (oldest is None or number > oldest):
+            parents = self.generation(number)["parents"][rows].ravel()
+            rows = np.unique(parents[parents >= 0])
+            if not len(rows):
+                break
+            number -= 1
+            ancestors[number] = rows
+        return ancestors
@@ -1,16 +1,35 @@
+import argparse
+import os
+import time
+import numpy as np
 import pygame
-from game_state import GameState, check_collision, update_obstacles
-from render_state import draw_obstacles
+from game_state import GameState
+from render_state import draw_background, draw_obstacles, render_text
 from player import Player
+from population import Population
+from simulation import step_frame
+from evaluation import ParallelEvaluator
+from environments import evaluate_environments
+from checkpoint import AsyncCheckpointer, load_checkpoint
+from islands import run_islands
+from lineage import LineageWriter
+from racing import race_population
+from profiler import STAGE_INPUT, STAGE_RENDER, FrameProfiler
+from recording import PopulationRecorder, load_episode, replay_frames
+from seeding import environment_seeds, generation_rng, generation_seed
+from telemetry import TelemetrySink, generation_record, summary_line
 import generation
 import constants 
 
+SIM_AHEAD_MAX_SPEED = 10000  # Slider maximum (simulation steps per second) in sim-ahead mode
+
 class SpeedSlider:
-    def __init__(self, x, y, width, height, min_val=10, max_val=120, initial_val=60):
+    def __init__(self, x, y, width, height, min_val=10, max_val=120, initial_val=60, unit="FPS"):
         self.rect = pygame.Rect(x, y, width, height)
         self.min_val = min_val
         self.max_val = max_val
         self.value = initial_val
+        self.unit = unit
         self.dragging = False
         self.handle_width = 20
         
@@ -44,7 +63,7 @@ class SpeedSlider:
         pygame.draw.rect(screen, (0, 0, 0), handle_rect, 2)
         
         # Draw label and value
-        label_text = font.render(f"Speed: {self.value} FPS", True, constants.TEXT_COLOR)
+        label_text = render_text(font, f"Speed: {self.value} {self.unit}")
         screen.blit(label_text, (self.rect.x, self.rect.y - 25)) 
 
 def handle_input(game_state, speed_slider):
@@ -60,18 +79,135 @@ def handle_input(game_state, speed_slider):
     return True  # Continue running if no quit event
 
 
-def run_game():
-    """Main game loop with optimized structure"""
+def draw_frame(screen, game_state, best_player, active_count, score_font, speed_slider=None, slider_font=None,
+               profiler=None):
+    """Render the lanes, obstacles and the best active player"""
+    # Background and lanes (static elements) come from one cached surface
+    draw_background(screen)
+    
+    # Draw speed slider first (on top)
+    if speed_slider is not None:
+        speed_slider.draw(screen, slider_font)
+    score_y = 50  # Below the slider
+    if profiler is not None:
+        profiler.draw(screen, slider_font, 230, 10)
+        score_y = 130  # Below the stage timings
+    
+    # Draw obstacles
+    draw_obstacles(screen, game_state)
+
+    # Draw UI for the best performing player
+    if active_count:
+        best_player.draw_player(screen)
+        # Only re-rendered when one of the values changes
+        score_text = render_text(
+            score_font,
+            f"Score: {best_player.score}, Obstacles Avoided: {best_player.obstacle_avoided}, Active: {active_count}"
+        )
+        screen.blit(score_text, (10, score_y))  # Moved down to avoid slider overlap
+    
+    pygame.display.flip()
+
+
+def draw_population(screen, game_state, population, score_font, speed_slider=None, slider_font=None,
+                    profiler=None):
+    """Render a frame showing the population's current leader"""
+    best_player = Player(population=population, index=population.best_index)
+    draw_frame(screen, game_state, best_player, population.alive_count, score_font, speed_slider, slider_font,
+               profiler)
+
+
+def resolve_seed(seed):
+    """Use the given base seed, or draw (and report) a fresh one so the run can be reproduced"""
+    if seed is None:
+        seed = int(np.random.SeedSequence().generate_state(1)[0])
+    print(f"Base seed: {seed}")
+    return seed
+
+
+def initial_population(seed=None, resume=None, strategy=None):
+    """Starting (population, generation_number, seed, strategy): random, or the generation after a checkpoint.
+
+    strategy names the evolution strategy (see generation.STRATEGIES), "ga"
+    by default. A checkpoint restores the strategy it was written with,
+    state included; naming a different one is an error.
+    """
+    if resume is None:
+        seed = resolve_seed(seed)
+        strategy = generation.make_strategy(strategy or "ga")
+        return Population.random(constants.POPULATION_SIZE, generation_rng(seed, 0)), 0, seed, strategy
+    checkpoint = load_checkpoint(resume)
+    if strategy is not None and strategy != checkpoint["strategy"]:
+        raise SystemExit(f"{resume} was written by the {checkpoint['strategy']} strategy, not {strategy}")
+    strategy = generation.make_strategy(checkpoint["strategy"])
+    strategy.load_state(checkpoint["strategy_state"])
+    seed = checkpoint["seed"]
+    print(f"Resuming after generation {checkpoint['generation']} (base seed {seed}, strategy {strategy.name})")
+    generation_number = checkpoint["generation"] + 1
+    population = strategy.next_generation(checkpoint["population"], rng=generation_rng(seed, generation_number))
+    return population, generation_number, seed, strategy
+
+
+def evolve(population, generation_number, seed, checkpointer=None, checkpoint_every=1, lineage=None,
+           strategy=None):
+    """Breed the next generation from an evaluated one, checkpointing every Nth generation"""
+    strategy = strategy if strategy is not None else generation.GeneticAlgorithm()
+    checkpoint = checkpointer is not None and (generation_number + 1) % checkpoint_every == 0
+    # Resume breeds from the checkpointed generation again, so it needs the state from before breeding
+    strategy_state = strategy.state() if checkpoint else None
+    next_population = strategy.next_generation(population, rng=generation_rng(seed, generation_number + 1))
+    if lineage is not None:
+        lineage.append(generation_number, population)
+    if checkpoint:
+        # Snapshot after breeding so fitness and diversity stats are included
+        checkpointer.submit(population, generation_number, seed, strategy.name, strategy_state)
+    return next_population
+
+
+def open_telemetry(path=None, port=None):
+    """TelemetrySink for the given file and/or HTTP port, or None if neither is set"""
+    if path is None and port is None:
+        return None
+    return TelemetrySink(path, port)
+
+
+def report_generation(population, generation_number, generation_start, run_start, telemetry=None,
+                      environments=1):
+    """Print a one-line summary of an evolved generation and stream its telemetry record"""
+    now = time.perf_counter()
+    record = generation_record(generation_number, population, now - generation_start, now - run_start,
+                               environments)
+    print(summary_line(record))
+    if telemetry is not None:
+        telemetry.emit(record)
+
+
+def run_game(seed=None, checkpoint_dir=None, checkpoint_every=1, resume=None, profile=False,
+             profile_trace=None, telemetry_path=None, telemetry_port=None, sim_ahead=False,
+             max_frames=constants.MAX_EPISODE_FRAMES, strategy=None):
+    """Main game loop with optimized structure.
+
+    Normally one simulation step is drawn per frame and the slider sets the
+    frame rate. With sim_ahead, the display refreshes at constants.FPS and
+    the slider sets simulation steps per second instead: each refresh runs
+    as many steps as are due, up to the time left in the frame, so training
+    can be watched live at close to headless speed. A generation ends once
+    every agent has died or max_frames frames have been played.
+
+    With profile, every frame stage is timed and rolling p50/p99 timings are
+    shown next to the speed slider; profile_trace (.json for Chrome tracing,
+    .jsonl for one record per frame) receives the most recent frames on exit.
+    Generation records go to telemetry_path / telemetry_port if given.
+    strategy names the evolution strategy (see generation.STRATEGIES); the
+    GA by default, or the checkpoint's strategy when resuming.
+    """
     pygame.init()
     screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
     pygame.display.set_caption("Temple Run AI")
     clock = pygame.time.Clock()
 
-    players : list[Player] = []
-    for i in range(constants.POPULATION_SIZE):
-        player = Player()
-        players.append(player)
-    saved_players = []
+    population, generation_number, seed, strategy = initial_population(seed, resume, strategy)
+    checkpointer = AsyncCheckpointer(checkpoint_dir) if checkpoint_dir is not None else None
     print(f"Game window created successfully! Starting with {constants.POPULATION_SIZE} players")  # Debug output
     print("Look for the 'Temple Run AI' window - it should be visible now!")
     
@@ -80,75 +216,308 @@ def run_game():
     slider_font = pygame.font.Font(None, 24)
     
     # Create speed slider
-    speed_slider = SpeedSlider(10, 10, 200, 20, min_val=10, max_val=600, initial_val=constants.FPS)
+    if sim_ahead:
+        speed_slider = SpeedSlider(10, 10, 200, 20, min_val=10, max_val=SIM_AHEAD_MAX_SPEED,
+                                   initial_val=10 * constants.FPS, unit="steps/s")
+    else:
+        speed_slider = SpeedSlider(10, 10, 200, 20, min_val=10, max_val=600, initial_val=constants.FPS)
+    owed_steps = 0.0
+    frame_budget = 1 / constants.FPS
+    episode_frames = 0
     
-    generation_number = 0
-    game_state = GameState()
-    active_players = players.copy()  # Start with all players active
+    game_state = GameState(generation_seed(seed, generation_number))
+    profiler = FrameProfiler() if profile or profile_trace else None
+    telemetry = open_telemetry(telemetry_path, telemetry_port)
+    run_start = generation_start = time.perf_counter()
     print("Starting game loop...")  # Debug output
 
-    while game_state.running:
-        # Handle input (including slider)
-        if not handle_input(game_state, speed_slider):
-            break
-        
-        if not active_players:
-            print("All players have died")
-            players = generation.NewGeneration(saved_players)
+    try:
+        while game_state.running:
+            if profiler is not None:
+                profiler.begin_frame()
+            # Handle input (including slider)
+            if not handle_input(game_state, speed_slider):
+                break
+            if profiler is not None:
+                profiler.lap(STAGE_INPUT)
+
+            if sim_ahead:
+                # Steps due at the slider's rate, run until the frame's time budget is spent
+                owed_steps += speed_slider.value / constants.FPS
+                deadline = time.perf_counter() + frame_budget
+            else:
+                owed_steps, deadline = 1, None
+            steps = 0
+            while owed_steps >= 1 and (steps == 0 or time.perf_counter() < deadline):
+                if max_frames and episode_frames >= max_frames:
+                    population.kill(population.alive)  # Episode length cap reached
+                if not population.alive_count:
+                    print("All players have died")
+                    evaluated = population
+                    population = evolve(population, generation_number, seed, checkpointer, checkpoint_every,
+                                        strategy=strategy)
+                    report_generation(evaluated, generation_number, generation_start, run_start, telemetry)
+                    generation_number += 1
+                    generation_start = time.perf_counter()
+                    game_state.reset(generation_seed(seed, generation_number))
+                    episode_frames = 0
+                    if profiler is not None:
+                        profiler.skip()  # Evolution is not part of the frame
+
+                # Update all players
+                step_frame(game_state, population, profiler=profiler)
+                episode_frames += 1
+                owed_steps -= 1
+                steps += 1
+            # Steps that did not fit are dropped rather than piling up
+            owed_steps = min(owed_steps, speed_slider.value / constants.FPS)
+     
+            # Render everything
+            render_start = time.perf_counter()
+            draw_population(screen, game_state, population, score_font, speed_slider, slider_font, profiler)
+            if profiler is not None:
+                profiler.lap(STAGE_RENDER)
+                profiler.end_frame()
+            if sim_ahead:
+                # Leave room in the next frame for input and drawing at the display rate
+                frame_budget = max(0.001, 1 / constants.FPS - 2 * (time.perf_counter() - render_start))
+                clock.tick(constants.FPS)
+            else:
+                clock.tick(speed_slider.value)  # Use slider value for FPS
+    finally:
+        if checkpointer is not None:
+            checkpointer.close()
+        if telemetry is not None:
+            telemetry.close()
+        if profile_trace:
+            profiler.export(profile_trace)
+        pygame.quit()
+
+
+def run_headless(max_generations=None, render_every=0, workers=0, environments=1, seed=None,
+                 record_dir=None, checkpoint_dir=None, checkpoint_every=1, resume=None,
+                 lineage_dir=None, telemetry_path=None, telemetry_port=None,
+                 max_frames=constants.MAX_EPISODE_FRAMES, race_episodes=0, strategy=None):
+    """Training loop with no display, no event pump and no frame cap.
+
+    If render_every > 0, every Nth generation is drawn to a window (uncapped)
+    so progress can be watched; all other generations run fully headless.
+    With workers > 0, non-rendered generations are evaluated on a process pool;
+    with environments > 1, fitness is averaged over that many seeded episodes.
+    All randomness derives from seed, so a run can be repeated exactly. With
+    record_dir, each locally simulated generation's champion is saved as an
+    episode file for offline replay. With checkpoint_dir, every Nth evaluated
+    generation is checkpointed in the background; resume continues a run from
+    a checkpoint exactly as if it had never stopped. With lineage_dir, every
+    evaluated generation is appended to an on-disk lineage history. One
+    telemetry record per generation goes to telemetry_path (.jsonl or .csv)
+    and/or is served on localhost:telemetry_port. Episodes are cut off after
+    max_frames frames (None or 0 for no limit). With race_episodes > 1,
+    non-rendered generations are evaluated locally by racing: up to that
+    many episodes per agent, with agents far from the elite cutoff retired
+    early (see racing.race_population). strategy names the evolution
+    strategy that breeds each generation (see generation.STRATEGIES); the GA
+    by default, or the checkpoint's strategy when resuming.
+    """
+    population, generation_number, seed, strategy = initial_population(seed, resume, strategy)
+    print(f"Headless training with {constants.POPULATION_SIZE} players")
+    if record_dir is not None:
+        os.makedirs(record_dir, exist_ok=True)
+
+    lineage = None
+    if lineage_dir is not None:
+        try:
+            lineage = LineageWriter(lineage_dir, population.brain.genomes().shape[1], generation_number,
+                                    resume=resume is not None)
+        except ValueError as error:
+            raise SystemExit(error)
+
+    screen = None
+    score_font = None
+    game_state = GameState()
+    # Racing evaluates locally, so it never needs the process pool
+    evaluator = ParallelEvaluator(workers) if workers > 0 and race_episodes <= 1 else None
+    checkpointer = AsyncCheckpointer(checkpoint_dir) if checkpoint_dir is not None else None
+    telemetry = open_telemetry(telemetry_path, telemetry_port)
+    run_start = time.perf_counter()
+
+    try:
+        while max_generations is None or generation_number < max_generations:
+            generation_start = time.perf_counter()
+            render = render_every > 0 and generation_number % render_every == 0
+            if render and screen is None:
+                pygame.init()
+                screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
+                pygame.display.set_caption("Temple Run AI")
+                score_font = pygame.font.Font(None, 36)
+
+            episode_seed = generation_seed(seed, generation_number)
+            game_state.reset(episode_seed)
+            recorder = None
+            episodes_per_agent = 1 if render else environments
+            if not render and race_episodes > 1:
+                episodes = race_population(population, environment_seeds(episode_seed, race_episodes),
+                                           max_frames=max_frames or None)
+                episodes_per_agent = float(episodes.mean())
+            elif not render and evaluator is not None:
+                evaluator.evaluate(population, episode_seed, max_frames or None, environments)
+            elif not render and environments > 1:
+                evaluate_environments(population, environment_seeds(episode_seed, environments),
+                                      max_frames or None)
+            elif record_dir is not None:
+                recorder = PopulationRecorder(episode_seed, generation_number)
+            frames = 0
+            while population.alive_count:
+                if max_frames and frames >= max_frames:
+                    population.kill(population.alive)  # Episode length cap reached
+                    break
+                step_frame(game_state, population, recorder)
+                frames += 1
+                if render:
+                    # Keep the window responsive without limiting the frame rate
+                    pygame.event.pump()
+                    draw_population(screen, game_state, population, score_font)
+            if recorder is not None:
+                recorder.save_champion(os.path.join(record_dir, f"generation_{generation_number:05d}.episode"),
+                                       population)
+
+            evaluated = population
+            population = evolve(population, generation_number, seed, checkpointer, checkpoint_every, lineage,
+                                strategy)
+            report_generation(evaluated, generation_number, generation_start, run_start, telemetry,
+                              episodes_per_agent)
             generation_number += 1
-            print(f"Generation {generation_number}")
-            saved_players.clear()  # Clear saved players for the new generation
-            game_state.reset()
-            
-        # Update all players
-        active_players = [p for p in players if not p.game_over]
-
-        for player in active_players:
-            player.think(game_state)  # AI decision-making
-            player.update_score()
-            
-        if active_players:
-            best_player = max(active_players, key=lambda p: p.score)
-            # Update obstacles once per frame (using first active player for difficulty)
-            update_obstacles(game_state, best_player)
-        # Check for collisions for all active players
-        for player in active_players:
-            if check_collision(game_state, player):
-                saved_players.append(player)
-                player.game_over = True
- 
-        # Render everything
-        screen.fill(constants.BACKGROUND_COLOR)
-        
-        # Draw speed slider first (on top)
-        speed_slider.draw(screen, slider_font)
-        
-        # Draw lanes (static elements)
-        for x in constants.LANE_LINES:
-            pygame.draw.line(screen, constants.LINE_COLOR, (x, 0), (x, constants.SCREEN_HEIGHT), 2)
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+        if checkpointer is not None:
+            checkpointer.close()
+        if telemetry is not None:
+            telemetry.close()
+        if screen is not None:
+            pygame.quit()
 
-        # Draw obstacles
-        draw_obstacles(screen, game_state.obstacles)
-        
-        # Draw all active players
-        #for player in active_players:
-         #   player.draw_player(screen)
-
-        # Draw UI for the first active player (or best performing player)
-        if active_players:
-            best_player = max(active_players, key=lambda p: p.score)
-            best_player.draw_player(screen)
-            score_text = score_font.render(
-                f"Score: {best_player.score}, Obstacles Avoided: {best_player.obstacle_avoided}, Active: {len(active_players)}", 
-                True, constants.TEXT_COLOR
-            )
-            screen.blit(score_text, (10, 50))  # Moved down to avoid slider overlap
-        
-        pygame.display.flip()
-        clock.tick(speed_slider.value)  # Use slider value for FPS
 
+def run_replay(path):
+    """Render a recorded episode at normal speed without running any inference"""
+    episode = load_episode(path)
+    pygame.init()
+    screen = pygame.display.set_mode((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
+    pygame.display.set_caption(f"Temple Run AI - replay of generation {episode['generation']}")
+    clock = pygame.time.Clock()
+    score_font = pygame.font.Font(None, 36)
+
+    for game_state, player in replay_frames(episode):
+        if any(event.type == pygame.QUIT for event in pygame.event.get()):
+            break
+        draw_frame(screen, game_state, player, 1, score_font)
+        clock.tick(constants.FPS)
     pygame.quit()
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Temple Run AI neuroevolution")
+    parser.add_argument("--headless", action="store_true",
+                        help="train without a window, event pump or frame cap")
+    parser.add_argument("--generations", type=int, default=None,
+                        help="stop headless training after this many generations")
+    parser.add_argument("--render-every", type=int, default=0,
+                        help="in headless mode, draw every Nth generation (0 = never)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="in headless mode, evaluate generations on this many processes")
+    parser.add_argument("--environments", type=int, default=1,
+                        help="in headless mode, average fitness over this many seeded episodes")
+    parser.add_argument("--max-frames", type=int, default=constants.MAX_EPISODE_FRAMES,
+                        help="end an episode after this many frames (0 = no limit)")
+    parser.add_argument("--race", type=int, default=0, metavar="EPISODES",
+                        help="in headless mode, race agents over up to this many episodes, "
+                             "retiring those far from the elite cutoff early")
+    parser.add_argument("--islands", type=int, default=0,
+                        help="in headless mode, evolve this many sub-populations in parallel processes")
+    parser.add_argument("--migration-interval", type=int, default=5,
+                        help="with --islands, exchange top genomes every N generations")
+    parser.add_argument("--migrants", type=int, default=10,
+                        help="with --islands, number of genomes each island sends per migration")
+    parser.add_argument("--strategy", choices=list(generation.STRATEGIES), default=None,
+                        help="evolution strategy: genetic algorithm (default), CMA-ES or antithetic "
+                             "natural ES; a resumed run keeps its checkpoint's strategy")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed for a reproducible run")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="in headless mode, save each generation's champion episode to DIR")
+    parser.add_argument("--replay", metavar="EPISODE", default=None,
+                        help="render a recorded episode file and exit")
+    parser.add_argument("--checkpoint", metavar="DIR", default=None,
+                        help="periodically write a population checkpoint to DIR")
+    parser.add_argument("--checkpoint-every", type=int, default=1,
+                        help="checkpoint every Nth generation")
+    parser.add_argument("--sim-ahead", action="store_true",
+                        help="draw at a fixed rate and let the slider set simulation steps per second")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each frame stage and show p50/p99 next to the speed slider")
+    parser.add_argument("--profile-trace", metavar="PATH", default=None,
+                        help="with the visual game, export recent frame timings (.json Chrome trace or .jsonl)")
+    parser.add_argument("--telemetry", metavar="PATH", default=None,
+                        help="append one record per generation to PATH (.jsonl or .csv)")
+    parser.add_argument("--telemetry-port", type=int, default=None,
+                        help="serve the latest generation record on localhost at this port (/metrics)")
+    parser.add_argument("--lineage", metavar="DIR", default=None,
+                        help="in headless mode, append every generation to a lineage history in DIR")
+    parser.add_argument("--resume", metavar="CHECKPOINT", default=None,
+                        help="continue training from a checkpoint file")
+    args = parser.parse_args()
+    if args.seed is not None and args.seed < 0:
+        parser.error("--seed must be non-negative")
+    if args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+    # Headless evaluation runs one of: racing, the worker pool (optionally over
+    # several environments), local environments, or a single recordable episode
+    if args.race > 0 and (args.workers > 0 or args.environments > 1):
+        parser.error("--race evaluates locally on its own episodes; drop --workers and --environments")
+    if args.record is not None and (args.workers > 0 or args.environments > 1 or args.race > 0):
+        parser.error("--record needs single-episode local evaluation; drop --workers, --environments and --race")
+    if args.migration_interval < 1:
+        parser.error("--migration-interval must be at least 1")
+    if args.islands > 1:
+        if not args.headless:
+            parser.error("--islands requires --headless")
+        if args.strategy not in (None, "ga"):
+            parser.error("--islands evolves each island with the genetic algorithm (--strategy ga)")
+        unsupported = [flag for flag, used in (
+            ("--checkpoint", args.checkpoint is not None), ("--resume", args.resume is not None),
+            ("--lineage", args.lineage is not None), ("--record", args.record is not None),
+            ("--workers", args.workers > 0), ("--race", args.race > 0),
+            ("--render-every", args.render_every > 0),
+        ) if used]
+        if unsupported:
+            parser.error(f"--islands cannot be combined with {', '.join(unsupported)}")
+    return args
+
 # Start the game
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    args = parse_args()
+    if args.replay:
+        run_replay(args.replay)
+    elif args.headless and args.islands > 1:
+        telemetry = open_telemetry(args.telemetry, args.telemetry_port)
+        try:
+            run_islands(args.islands, resolve_seed(args.seed), generations=args.generations,
+                        migration_interval=args.migration_interval, migrants=args.migrants,
+                        environments=args.environments, max_frames=args.max_frames or None,
+                        telemetry=telemetry)
+        finally:
+            if telemetry is not None:
+                telemetry.close()
+    elif args.headless:
+        run_headless(max_generations=args.generations, render_every=args.render_every,
+                     workers=args.workers, environments=args.environments, seed=args.seed,
+                     record_dir=args.record, checkpoint_dir=args.checkpoint,
+                     checkpoint_every=args.checkpoint_every, resume=args.resume,
+                     lineage_dir=args.lineage, telemetry_path=args.telemetry,
+                     telemetry_port=args.telemetry_port, max_frames=args.max_frames,
+                     race_episodes=args.race, strategy=args.strategy)
+    else:
+        run_game(seed=args.seed, checkpoint_dir=args.checkpoint, checkpoint_every=args.checkpoint_every,
+                 resume=args.resume, profile=args.profile, profile_trace=args.profile_trace,
+                 telemetry_path=args.telemetry, telemetry_port=args.telemetry_port,
+                 sim_ahead=args.sim_ahead, max_frames=args.max_frames, strategy=args.strategy)
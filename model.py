@@ -2,48 +2,100 @@ import numpy as np
 # full connected multi-layer neural network model
 # inference only
 # no external dependencies
+GENOME_DTYPE = np.float32
+
 def softmax(x):
     """Compute softmax values for each sets of scores in x."""
     e_x = np.exp(x - np.max(x))
     return e_x / e_x.sum()
 
+def genome_size(input_size, hidden_layers, output_size):
+    """Number of genes in a NeuralNetwork genome"""
+    return (input_size * hidden_layers + hidden_layers * output_size
+            + hidden_layers + output_size)
+
+def genome_views(genomes, input_size, hidden_layers, output_size):
+    """Weight and bias views into a genome (or the rows of a genome matrix).
+
+    The layout is [weights_input_hidden, weights_hidden_output, biases_hidden,
+    biases_output]; the views share memory with genomes, nothing is copied.
+    """
+    lead = genomes.shape[:-1]
+    idx = 0
+    size = input_size * hidden_layers
+    weights_input_hidden = genomes[..., idx:idx + size].reshape(lead + (hidden_layers, input_size))
+    idx += size
+    size = hidden_layers * output_size
+    weights_hidden_output = genomes[..., idx:idx + size].reshape(lead + (output_size, hidden_layers))
+    idx += size
+    biases_hidden = genomes[..., idx:idx + hidden_layers]
+    idx += hidden_layers
+    biases_output = genomes[..., idx:idx + output_size]
+    return weights_input_hidden, weights_hidden_output, biases_hidden, biases_output
+
+def unique_genome_rows(genomes):
+    """Collapse byte-identical genome rows.
+
+    Returns (first_rows, inverse): the first row holding each distinct
+    genome, in row order, and for every row the index of its genome in
+    first_rows, so genomes[first_rows][inverse] reproduces genomes.
+    """
+    genomes = np.ascontiguousarray(genomes)
+    keys = genomes.view(np.dtype((np.void, genomes.dtype.itemsize * genomes.shape[1]))).ravel()
+    _, first_rows, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first_rows)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first_rows[order], rank[inverse.ravel()]
+
+class GenomeArena:
+    """Double-buffered, preallocated float32 (N, genome_length) genome storage.
+
+    The active buffer holds the current generation; the next generation is
+    written into the spare buffer and the two are swapped, so no genome memory
+    is allocated between generations.
+    """
+    def __init__(self, size, genome_length):
+        self.size = size
+        self.genome_length = genome_length
+        self.buffers = [np.zeros((size, genome_length), dtype=GENOME_DTYPE) for _ in range(2)]
+        self.current = 0
+
+    @property
+    def active(self):
+        return self.buffers[self.current]
+
+    @property
+    def spare(self):
+        return self.buffers[1 - self.current]
+
+    def swap(self):
+        """Make the spare buffer the active one; returns the new active buffer"""
+        self.current = 1 - self.current
+        return self.active
+
 class NeuralNetwork:
-    def __init__(self, input_size, hidden_layers, output_size):
+    def __init__(self, input_size, hidden_layers, output_size, genome=None, rng=None):
         self.input_nodes = input_size
         self.hidden_nodes = hidden_layers
         self.output_nodes = output_size
 
-        self.weights_input_hidden = np.random.uniform(-1, 1, (self.hidden_nodes, self.input_nodes))
-        self.weights_hidden_output = np.random.uniform(-1, 1, (self.output_nodes, self.hidden_nodes))
-
-        self.biases_hidden = np.random.uniform(-1, 1, (self.hidden_nodes))
-        self.biases_output = np.random.uniform(-1, 1, (self.output_nodes))
+        if genome is None:
+            rng = rng if rng is not None else np.random
+            genome = rng.uniform(-1, 1, genome_size(input_size, hidden_layers, output_size))
+            genome = genome.astype(GENOME_DTYPE)
+        self.set_genome(genome)
     
     def get_genome(self):
-        
-        genome = np.concatenate([
-            self.weights_input_hidden.flatten(),
-            self.weights_hidden_output.flatten(),
-            self.biases_hidden,
-            self.biases_output
-        ])
-        return genome
+        """Flat genome; weights and biases are views into it, so this does not copy"""
+        return self.genome
     
     def set_genome(self, genome):
-        idx = 0
-        
-        size = self.input_nodes * self.hidden_nodes
-        self.weights_input_hidden = genome[idx:idx + size].reshape(self.hidden_nodes, self.input_nodes)
-        idx += size
-
-        size = self.hidden_nodes * self.output_nodes
-        self.weights_hidden_output = genome[idx:idx + size].reshape(self.output_nodes, self.hidden_nodes)
-        idx += size
-
-        self.biases_hidden = genome[idx:idx + self.hidden_nodes]
-        idx += self.hidden_nodes
-
-        self.biases_output = genome[idx:idx + self.output_nodes]
+        """Adopt genome as backing storage (e.g. a row of a GenomeArena) without copying"""
+        self.genome = genome
+        (self.weights_input_hidden, self.weights_hidden_output,
+         self.biases_hidden, self.biases_output) = genome_views(
+            genome, self.input_nodes, self.hidden_nodes, self.output_nodes)
 
     def sigmoid(self, x):
         """Sigmoid activation function"""
@@ -59,4 +111,129 @@ class NeuralNetwork:
         raw_output = np.dot(self.weights_hidden_output, hidden_output) + self.biases_output
         # predictions = softmax(raw_output)
         action = np.argmax(raw_output)
-        return action
\ No newline at end of file
+        return action
+
+class PopulationBrain:
+    """Batched inference for a whole population of NeuralNetworks.
+
+    Genomes live in one (N, genome_length) matrix, usually a GenomeArena
+    buffer; the (N, hidden, in) / (N, out, hidden) tensors are views into it,
+    so every agent's action is computed with one batched matmul per layer.
+    Inside a simulated episode, clones (byte-identical genomes, e.g.
+    carried-over elites and unmutated children) always share a lane and hence
+    an input; predict can then run once per distinct genome (see distinct).
+    """
+    def __init__(self, genomes, input_size, hidden_layers, output_size, arena=None):
+        self.size = len(genomes)
+        self.input_nodes = input_size
+        self.hidden_nodes = hidden_layers
+        self.output_nodes = output_size
+        self.arena = arena
+
+        self.genome_matrix = genomes
+        (self.weights_input_hidden, self.weights_hidden_output,
+         self.biases_hidden, self.biases_output) = genome_views(
+            genomes, input_size, hidden_layers, output_size)
+
+        # Compacted copies of the tensors for the currently alive agents
+        self._alive_count = self.size
+        self._alive_idx = np.arange(self.size)
+        self._compact = None
+        self._distinct = None
+
+    @classmethod
+    def from_arena(cls, arena, input_size, hidden_layers, output_size):
+        """Brain over the arena's active buffer"""
+        return cls(arena.active, input_size, hidden_layers, output_size, arena=arena)
+
+    @classmethod
+    def from_networks(cls, networks):
+        first = networks[0]
+        arena = GenomeArena(len(networks), len(first.get_genome()))
+        for row, network in zip(arena.active, networks):
+            row[:] = network.get_genome()
+        return cls.from_arena(arena, first.input_nodes, first.hidden_nodes, first.output_nodes)
+
+    @classmethod
+    def from_genomes(cls, genomes, input_size, hidden_layers, output_size):
+        """Build from an (N, genome_length) matrix laid out like NeuralNetwork.get_genome"""
+        arena = GenomeArena(len(genomes), genomes.shape[1])
+        arena.active[:] = genomes
+        return cls.from_arena(arena, input_size, hidden_layers, output_size)
+
+    @classmethod
+    def random(cls, size, input_size, hidden_layers, output_size, rng=None):
+        """Random population drawn with a single RNG call"""
+        rng = rng if rng is not None else np.random
+        arena = GenomeArena(size, genome_size(input_size, hidden_layers, output_size))
+        arena.active[:] = rng.uniform(-1, 1, arena.active.shape)
+        return cls.from_arena(arena, input_size, hidden_layers, output_size)
+
+    def genomes(self):
+        """(N, genome_length) matrix of all genomes (the backing storage, not a copy)"""
+        return self.genome_matrix
+
+    def network(self, index):
+        """NeuralNetwork for one agent whose weights are views into its genome row"""
+        return NeuralNetwork(self.input_nodes, self.hidden_nodes, self.output_nodes,
+                             genome=self.genome_matrix[index])
+
+    def _alive_tensors(self, alive):
+        """Return tensors restricted to alive agents, re-gathering only when deaths occur"""
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == self.size:
+            return self._alive_idx, (self.weights_input_hidden, self.weights_hidden_output,
+                                     self.biases_hidden, self.biases_output)
+        if self._compact is None or alive_count != self._alive_count:
+            idx = np.flatnonzero(alive)
+            self._alive_idx = idx
+            self._alive_count = alive_count
+            self._compact = (self.weights_input_hidden[idx], self.weights_hidden_output[idx],
+                             self.biases_hidden[idx], self.biases_output[idx])
+        return self._alive_idx, self._compact
+
+    def distinct(self):
+        """(first_rows, inverse, brain over the distinct genomes or None if there are no clones)"""
+        if self._distinct is None:
+            first_rows, inverse = unique_genome_rows(self.genome_matrix)
+            brain = None
+            if len(first_rows) < self.size:
+                brain = PopulationBrain(self.genome_matrix[first_rows], self.input_nodes,
+                                        self.hidden_nodes, self.output_nodes)
+            self._distinct = (first_rows, inverse, brain)
+        return self._distinct
+
+    def reset_alive(self):
+        """Forget the cached alive set and clone map (call when a new episode starts)"""
+        self._alive_count = self.size
+        self._alive_idx = np.arange(self.size)
+        self._compact = None
+        self._distinct = None
+
+    def predict(self, inputs, alive=None, clones_share_input=False):
+        """Compute actions for all agents.
+
+        inputs is an (N, input_size) array. Rows of dead agents (alive == False)
+        are skipped and get action 1 (stay put). With clones_share_input, the
+        caller guarantees that clones have equal inputs and alive flags (true
+        within one simulated episode), so only the first row of each distinct
+        genome is evaluated and its action is fanned out to the clones.
+        """
+        if alive is None:
+            alive = np.ones(self.size, dtype=bool)
+        if clones_share_input:
+            first_rows, inverse, distinct = self.distinct()
+            if distinct is not None:
+                return distinct.predict(inputs[first_rows], alive[first_rows])[inverse]
+
+        actions = np.ones(self.size, dtype=np.int64)
+        idx, (w_ih, w_ho, b_h, b_o) = self._alive_tensors(alive)
+        if len(idx) == 0:
+            return actions
+
+        x = inputs[idx] if len(idx) != self.size else inputs
+        hidden_output = np.matmul(w_ih, x[:, :, None])[:, :, 0] + b_h
+        hidden_output = np.tanh(np.clip(hidden_output, -500, 500))
+        raw_output = np.matmul(w_ho, hidden_output[:, :, None])[:, :, 0] + b_o
+        actions[idx] = np.argmax(raw_output, axis=1)
+        return actions
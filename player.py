@@ -1,35 +1,86 @@
 import numpy as np
-import pygame
 import constants
 from model import NeuralNetwork
+from population import Population
+from sensors import lane_observations
+
+
+def _population_field(name, cast=int):
+    """Property reading/writing one agent's entry of a Population array"""
+    def getter(self):
+        return cast(getattr(self.population, name)[self.index])
+
+    def setter(self, value):
+        getattr(self.population, name)[self.index] = value
+    return property(getter, setter)
 
 
 class Player:
-    def __init__(self, brain = None):
-        self.score = 0
-        self.fitness = 0
-        self.player_lane = 1
-        self.survival_time = 0
-        self.moves_made = 0
-        self.passed_obstacles = []
-        self.obstacle_avoided = 0
-        self.game_over = False
-        if(brain is not None):
-            self.brain = brain
+    """Thin view onto one agent of a Population.
+
+    Player(brain) without a population creates a standalone one-agent population.
+    The simulation never needs pygame; it is only imported when a Player is
+    drawn or its pygame.Rect is requested.
+    """
+    def __init__(self, brain = None, population = None, index = 0):
+        if population is None:
+            if brain is None:
+                brain = NeuralNetwork(constants.INPUT_NODES, constants.HIDDEN_NODES, constants.OUTPUT_NODES)
+            population = Population.from_networks([brain])
+            index = 0
+        self.population = population
+        self.index = index
+
+    score = _population_field("score")
+    fitness = _population_field("fitness", float)
+    player_lane = _population_field("lane")
+    survival_time = _population_field("survival_time")
+    moves_made = _population_field("moves_made")
+    obstacle_avoided = _population_field("obstacle_avoided")
+
+    @property
+    def game_over(self):
+        return not self.population.alive[self.index]
+
+    @game_over.setter
+    def game_over(self, value):
+        mask = np.zeros(self.population.size, dtype=bool)
+        mask[self.index] = True
+        if value:
+            self.population.kill(mask)
         else:
-            self.brain = NeuralNetwork(8,8,3)
-        self.player_rect = pygame.Rect(
-            constants.LANE_X[self.player_lane] - constants.PLAYER_WIDTH // 2, 
-            constants.PLAYER_Y, 
-            constants.PLAYER_WIDTH, 
-            constants.PLAYER_HEIGHT
-        )
+            self.population.alive[self.index] = True
+            self.population.alive_count = int(np.count_nonzero(self.population.alive))
+
+    @property
+    def brain(self):
+        return self.population.brain.network(self.index)
+
+    @property
+    def player_box(self):
+        """(left, top, width, height) of the player in plain numbers"""
+        return (constants.LANE_X[self.player_lane] - constants.PLAYER_WIDTH // 2,
+                constants.PLAYER_Y, constants.PLAYER_WIDTH, constants.PLAYER_HEIGHT)
+
+    @property
+    def player_center(self):
+        left, top, width, height = self.player_box
+        return left + width // 2, top + height // 2
+
+    @property
+    def player_rect(self):
+        import pygame
+        return pygame.Rect(self.player_box)
 
     def think(self, game_state):
         """Move player left (-1) or right (1)"""
         state = np.array(self.get_state(game_state))
         action = self.brain.predict(state)
         # action = np.argmax(1-state)
+        self.apply_action(action)
+
+    def apply_action(self, action):
+        """Apply a network action: 0 = left, 1 = stay, 2 = right"""
         # Consider changing action mapping to encourage movement:
         if action == 0:     # Move left
             self.move_player(-1)
@@ -43,7 +94,6 @@ class Player:
         if 0 <= new_lane < constants.NUM_LANES:
             self.player_lane = new_lane
             self.moves_made += 1
-            self.player_rect.x = constants.LANE_X[self.player_lane] - constants.PLAYER_WIDTH // 2
 
     def update_score(self):
         """Update score based on survival time and obstacles avoided"""
@@ -62,92 +112,16 @@ class Player:
         elif self.fitness > 0.77:
             return constants.PLAYER_COLOR[2]["color"]
     def draw_player(self, screen):
-        """Draw player as a pixelated circle"""
-        player_color_fitness = self.get_color()
-        
-        # Get center position of the player
-        center_x = self.player_rect.centerx
-        center_y = self.player_rect.centery
-        
-        # Create a pixelated circle using small squares
-        pixel_size = 3
-        radius = 8  # Radius in pixels
-        
-        # Create a darker outline color
-        outline_color = tuple(max(0, c - 50) for c in player_color_fitness[:3])
-        
-        # Draw pixelated circle by drawing squares in a circular pattern
-        for y in range(-radius, radius + 1):
-            for x in range(-radius, radius + 1):
-                # Check if this pixel is within the circle
-                distance = (x * x + y * y) ** 0.5
-                
-                if distance <= radius:
-                    pixel_x = center_x + x * pixel_size
-                    pixel_y = center_y + y * pixel_size
-                    
-                    # Draw outline for edge pixels
-                    if distance > radius - 1.5:
-                        pygame.draw.rect(screen, outline_color, 
-                                       pygame.Rect(pixel_x, pixel_y, pixel_size, pixel_size))
-                    else:
-                        # Draw filled pixels
-                        pygame.draw.rect(screen, player_color_fitness,
-                                       pygame.Rect(pixel_x, pixel_y, pixel_size, pixel_size))
+        """Draw player as a pixelated circle (a cached sprite per fitness color)"""
+        from render_state import draw_player_sprite
+        draw_player_sprite(screen, self.get_color(), self.player_center)
 
     def get_state(self, game_state):
         """Get the current state for AI decision making"""
-        player_lane = self.player_lane  # index
-        one_hot_location = [0, 0, 0]
-        one_hot_location[player_lane] = 1
-        
-        if game_state.obstacles:
-            ahead_obstacles = [o for o in game_state.obstacles if o['y'] < self.player_rect.y]
-            if ahead_obstacles:
-                closest = max(ahead_obstacles, key=lambda o: o['y'])
-                try:
-                    obstacle_lane = constants.LANE_X.index(closest['x'])
-                except ValueError:
-                    obstacle_lane = -1
-                obstacle_distance = self.player_rect.y - closest['y']
-            else:
-                obstacle_lane = -1
-                obstacle_distance = 999
-        else:
-            obstacle_lane = -1
-            obstacle_distance = 999
-        # info about all lane danger
-
-        # Safety score for staying in current lane
-        current_safety = self.calculate_lane_safety(self.player_lane, game_state)
-        
-        # Safety score for moving left
-        left_lane = self.player_lane - 1
-        left_safety = self.calculate_lane_safety(left_lane, game_state) if left_lane >= 0 else 0
-        
-        # Safety score for moving right  
-        right_lane = self.player_lane + 1
-        right_safety = self.calculate_lane_safety(right_lane, game_state) if right_lane < constants.NUM_LANES else 0
-
-        return one_hot_location + [obstacle_lane, obstacle_distance,current_safety, left_safety, right_safety]
+        return lane_observations(game_state)[self.player_lane].tolist()
 
     def calculate_lane_safety(self, lane, game_state):
         """Calculate how safe a lane is (0=dangerous, 1=safe)"""
         if lane < 0 or lane >= constants.NUM_LANES:
             return 0  # Invalid lane
-        
-        max_danger = 0  # Track the highest danger from any single obstacle
-        lane_x = constants.LANE_X[lane]
-        
-        for obstacle in game_state.obstacles:
-            if obstacle['x'] == lane_x:
-                # Calculate distance (positive = obstacle is above player, negative = below)
-                distance = self.player_rect.y - obstacle['y']
-                
-                # Only consider obstacles above the player that pose a threat
-                if distance > 0 and distance < 300:  # Look ahead 300 pixels up
-                    # Closer obstacles are more dangerous (inverse relationship)
-                    danger = max(0, (300 - distance) / 300)
-                    max_danger = max(max_danger, danger)  # Keep the highest danger
-        
-        return 1 - max_danger  # Convert danger to safety (1=safe, 0=dangerous)
\ No newline at end of file
+        return lane_observations(game_state)[lane][5]
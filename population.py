@@ -0,0 +1,85 @@
+import numpy as np
+import constants
+from model import PopulationBrain
+
+
+class Population:
+    """Struct-of-arrays container for every agent of a generation.
+
+    Per-agent state (lane, score, counters, alive flag) lives in contiguous
+    NumPy arrays and is updated vectorially; player.Player is only a thin
+    view onto one row for rendering and single-agent use.
+    """
+    def __init__(self, brain):
+        self.brain = brain
+        self.size = brain.size
+        self.lane = np.ones(self.size, dtype=np.int64)
+        self.score = np.zeros(self.size, dtype=np.int64)
+        self.fitness = np.zeros(self.size)
+        self.survival_time = np.zeros(self.size, dtype=np.int64)
+        self.moves_made = np.zeros(self.size, dtype=np.int64)
+        self.obstacle_avoided = np.zeros(self.size, dtype=np.int64)
+        self.alive = np.ones(self.size, dtype=bool)
+        self.alive_count = self.size
+        self.best_index = 0
+        self.max_tier = 0  # Highest difficulty tier the evaluation reached
+        self.parents = np.full((self.size, 2), -1, dtype=np.int64)  # Rows in the previous generation, -1 if none
+        self.diversity_stats = None  # Filled in by generation.NewGeneration once evaluated
+        self.evolution_stats = None  # Elite count and adaptive mutation chosen by NewGeneration
+        self.states = np.zeros((self.size, brain.input_nodes), dtype=brain.genome_matrix.dtype)
+
+    @classmethod
+    def random(cls, size, rng=None):
+        return cls(PopulationBrain.random(size, constants.INPUT_NODES,
+                                          constants.HIDDEN_NODES, constants.OUTPUT_NODES, rng))
+
+    @classmethod
+    def from_networks(cls, networks):
+        return cls(PopulationBrain.from_networks(networks))
+
+    def reset(self):
+        """Reset all agents for a new episode, keeping their brains"""
+        self.lane[:] = 1
+        self.score[:] = 0
+        self.survival_time[:] = 0
+        self.moves_made[:] = 0
+        self.obstacle_avoided[:] = 0
+        self.alive[:] = True
+        self.alive_count = self.size
+        self.best_index = 0
+        self.max_tier = 0
+        self.brain.reset_alive()
+
+    def apply_actions(self, actions):
+        """Move alive agents: 0 = left, 1 = stay, 2 = right (blocked at the edges)"""
+        new_lane = self.lane + (actions - 1)
+        moved = self.alive & (new_lane != self.lane) & (new_lane >= 0) & (new_lane < constants.NUM_LANES)
+        self.lane[moved] = new_lane[moved]
+        self.moves_made += moved
+
+    def update_scores(self):
+        """Update score based on survival time and obstacles avoided"""
+        self.survival_time += self.alive
+        base_score = self.survival_time // 10
+        bonus_score = self.obstacle_avoided * 10
+        np.copyto(self.score, base_score + bonus_score, where=self.alive)
+
+    def kill(self, mask):
+        """Mark agents as dead and keep the best alive agent up to date"""
+        mask = mask & self.alive
+        if not mask.any():
+            return
+        self.alive &= ~mask
+        self.alive_count = int(np.count_nonzero(self.alive))
+        if not self.alive[self.best_index]:
+            self.update_best()
+
+    def update_best(self):
+        """Recompute the best alive agent (first one with the highest score).
+
+        Alive agents share the same survival time and only the leader is
+        credited for avoided obstacles, so the leader can only change when it
+        dies; this full scan is needed only then.
+        """
+        if self.alive_count:
+            self.best_index = int(np.argmax(np.where(self.alive, self.score, -1)))
@@ -0,0 +1,97 @@
+import json
+import time
+import numpy as np
+import constants
+
+# Stages of one frame, in the order they run; stage ids index the ring buffers
+STAGES = ("input", "sense", "think", "obstacles", "collision", "render")
+STAGE_INPUT, STAGE_SENSE, STAGE_THINK, STAGE_OBSTACLES, STAGE_COLLISION, STAGE_RENDER = range(len(STAGES))
+
+OVERLAY_REFRESH_FRAMES = 30  # Percentiles are recomputed (and text re-rendered) this often
+
+
+class FrameProfiler:
+    """Opt-in per-stage frame timer.
+
+    Each lap() stores the nanoseconds since the previous lap into a
+    preallocated (stage, frame) ring buffer, so profiling allocates nothing
+    per frame. Callers hold an optional profiler and guard every call with
+    `if profiler is not None`, which keeps the disabled path free.
+    """
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.starts = np.zeros((len(STAGES), capacity), dtype=np.int64)
+        self.durations = np.zeros((len(STAGES), capacity), dtype=np.int64)
+        self.frames = 0
+        self._slot = 0
+        self._last = 0
+        self._origin = time.perf_counter_ns()
+        self._overlay = []
+
+    def begin_frame(self):
+        self._slot = self.frames % self.capacity
+        self.durations[:, self._slot] = 0
+        self._last = time.perf_counter_ns()
+
+    def lap(self, stage):
+        """Charge the time since the previous lap (or begin_frame) to stage"""
+        now = time.perf_counter_ns()
+        self.starts[stage, self._slot] = self._last
+        self.durations[stage, self._slot] += now - self._last
+        self._last = now
+
+    def skip(self):
+        """Restart the lap timer without charging the elapsed time to any stage"""
+        self._last = time.perf_counter_ns()
+
+    def end_frame(self):
+        self.frames += 1
+
+    def recorded(self):
+        """(start, duration) arrays of the frames still in the ring, oldest first"""
+        count = min(self.frames, self.capacity)
+        order = (np.arange(count) + self.frames - count) % self.capacity
+        return self.starts[:, order], self.durations[:, order]
+
+    def percentiles(self, q=(50, 99)):
+        """(len(STAGES), len(q)) rolling stage percentiles in milliseconds"""
+        _, durations = self.recorded()
+        if not durations.shape[1]:
+            return np.zeros((len(STAGES), len(q)))
+        return np.percentile(durations, q, axis=1).T / 1e6
+
+    def draw(self, screen, font, x, y):
+        """Draw rolling p50/p99 per stage, one line each, starting at (x, y)"""
+        if not self._overlay or self.frames % OVERLAY_REFRESH_FRAMES == 0:
+            stats = self.percentiles()
+            self._overlay = [
+                font.render(f"{stage:>9} p50 {p50:6.2f} ms  p99 {p99:6.2f} ms", True, constants.TEXT_COLOR)
+                for stage, (p50, p99) in zip(STAGES, stats)
+            ]
+        for line, text in enumerate(self._overlay):
+            screen.blit(text, (x, y + line * text.get_height()))
+
+    def export(self, path):
+        """Write the frames in the ring as a Chrome trace (.json) or one object per frame (.jsonl)"""
+        starts, durations = self.recorded()
+        first_frame = self.frames - durations.shape[1]
+        if path.endswith(".jsonl"):
+            with open(path, "w") as f:
+                for column in range(durations.shape[1]):
+                    record = {"frame": first_frame + column}
+                    record.update((stage, int(durations[s, column])) for s, stage in enumerate(STAGES))
+                    f.write(json.dumps(record) + "\n")
+            return
+
+        events = []
+        for column in range(durations.shape[1]):
+            for s, stage in enumerate(STAGES):
+                if durations[s, column]:
+                    events.append({
+                        "name": stage, "ph": "X", "pid": 0, "tid": 0,
+                        "ts": (int(starts[s, column]) - self._origin) / 1000,
+                        "dur": int(durations[s, column]) / 1000,
+                        "args": {"frame": first_frame + column},
+                    })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
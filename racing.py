@@ -0,0 +1,53 @@
+import math
+import numpy as np
+import constants
+from environments import set_mean_stats, simulate_environments
+from model import PopulationBrain
+
+STAT_FIELDS = ("score", "survival_time", "obstacle_avoided", "moves_made")
+
+
+def contender_brain(brain, rows):
+    """PopulationBrain over a subset of agents (their genomes are copied)"""
+    return PopulationBrain(brain.genomes()[rows], brain.input_nodes, brain.hidden_nodes, brain.output_nodes)
+
+
+def race_population(population, seeds, elite_fraction=0.2, eta=2, max_frames=constants.MAX_EPISODE_FRAMES):
+    """Evaluate a Population over up to len(seeds) episodes, spending them where they matter.
+
+    Every agent plays the first episode. After each episode, agents are
+    ranked by their mean score so far against the elite cutoff (the score of
+    the elite_fraction-th best agent). Only the ceil(k / eta) contenders
+    closest to that cutoff play on; agents far above it are retired as sure
+    elites and agents far below as hopeless. Episodes stop at max_frames, so
+    the cost of a generation is bounded by
+    size * max_frames * (1 + 1/eta + 1/eta**2 + ...) agent-steps.
+
+    Per-agent stats become means over the episodes each agent played.
+    Returns the number of episodes played per agent.
+    """
+    size = population.size
+    elite_count = max(1, int(size * elite_fraction))
+    totals = {field: np.zeros(size, dtype=np.int64) for field in STAT_FIELDS}
+    episodes = np.zeros(size, dtype=np.int64)
+    contenders = np.arange(size)
+    max_tier = 0
+
+    for episode, seed in enumerate(seeds):
+        stats = simulate_environments(contender_brain(population.brain, contenders), [seed], max_frames)
+        for field, total in totals.items():
+            total[contenders] += stats[field][0]
+        episodes[contenders] += 1
+        max_tier = max(max_tier, int(stats["max_tier"].max()))
+        if episode == len(seeds) - 1:
+            break
+
+        mean_score = totals["score"] / episodes
+        cutoff = np.sort(mean_score)[::-1][elite_count - 1]
+        keep = math.ceil(len(contenders) / eta)
+        distance = np.abs(mean_score[contenders] - cutoff)
+        contenders = np.sort(contenders[np.argsort(distance, kind="stable")[:keep]])
+
+    set_mean_stats(population, {field: total / episodes for field, total in totals.items()})
+    population.max_tier = max_tier
+    return episodes
@@ -0,0 +1,89 @@
+import struct
+import numpy as np
+from game_state import GameState, advance_obstacles, check_collision
+from player import Player
+
+# Episode file: fixed header followed by one byte per frame.
+# Each frame byte packs the agent's action (bits 0-1) and the difficulty
+# tier the obstacles advanced at (bits 2-4); together with the seed this is
+# enough to rebuild the run exactly without re-running any inference.
+EPISODE_MAGIC = b"TREP"
+EPISODE_VERSION = 1
+_HEADER = struct.Struct("<4sHQIqI")  # magic, version, seed, generation, genome id, frames
+_ACTION_MASK = 0b11
+_TIER_SHIFT = 2
+
+
+class PopulationRecorder:
+    """Collects every agent's per-frame action during one seeded episode.
+
+    The champion is only known once the episode is over, so all actions are
+    kept (one byte per agent per frame) and any agent can be saved afterwards.
+    """
+    def __init__(self, seed, generation=0):
+        self.seed = seed
+        self.generation = generation
+        self.frames = []
+        self.tiers = bytearray()
+
+    def record(self, actions, tier):
+        self.frames.append(actions.astype(np.uint8))
+        self.tiers.append(tier)
+
+    def save(self, path, genome_id, frames):
+        """Write the first `frames` frames of agent genome_id to path"""
+        actions = np.array([frame[genome_id] for frame in self.frames[:frames]], dtype=np.uint8)
+        tiers = np.frombuffer(bytes(self.tiers[:frames]), dtype=np.uint8)
+        packed = (actions & _ACTION_MASK) | (tiers << _TIER_SHIFT)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(EPISODE_MAGIC, EPISODE_VERSION, self.seed, self.generation,
+                                 genome_id, len(packed)))
+            f.write(packed.tobytes())
+
+    def save_champion(self, path, population):
+        """Save the highest-scoring agent of the finished episode; returns its index"""
+        champion = int(np.argmax(population.score))
+        self.save(path, champion, int(population.survival_time[champion]))
+        return champion
+
+
+def load_episode(path):
+    """Read an episode file into a dict (seed, generation, genome_id, actions, tiers)"""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        magic, version, seed, generation, genome_id, frames = _HEADER.unpack(header)
+        if magic != EPISODE_MAGIC or version != EPISODE_VERSION:
+            raise ValueError(f"{path} is not a version {EPISODE_VERSION} episode file")
+        packed = np.frombuffer(f.read(frames), dtype=np.uint8)
+    return {
+        "seed": seed,
+        "generation": generation,
+        "genome_id": genome_id,
+        "actions": packed & _ACTION_MASK,
+        "tiers": packed >> _TIER_SHIFT,
+    }
+
+
+def replay_frames(episode):
+    """Rebuild a recorded run frame by frame, yielding (game_state, player).
+
+    Only the recorded agent is simulated; obstacles follow the episode seed
+    and the recorded difficulty tiers. Obstacle credit is given to the
+    replayed agent, so its score can differ from the live run if it was not
+    the leader.
+    """
+    game_state = GameState(episode["seed"])
+    player = Player()
+    for action, tier in zip(episode["actions"].tolist(), episode["tiers"].tolist()):
+        player.apply_action(action)
+        player.update_score()
+        player.obstacle_avoided += advance_obstacles(game_state, tier)
+        if check_collision(game_state, player):
+            player.game_over = True
+        yield game_state, player
+
+
+def verify_episode(episode):
+    """True if replaying the episode ends in a collision exactly on its last frame"""
+    deaths = [frame for frame, (_, player) in enumerate(replay_frames(episode)) if player.game_over]
+    return deaths[:1] == [len(episode["actions"]) - 1]
@@ -1,16 +1,73 @@
 import pygame
 import constants
 
-def draw_obstacles(screen, obstacles):
-    """Optimized obstacle drawing with batch operations"""
-    for obstacle in obstacles:
-        obstacle_rect = pygame.Rect(
-            obstacle['x'] - constants.OBSTACLE_WIDTH // 2, 
-            obstacle['y'], 
-            constants.OBSTACLE_WIDTH, 
-            constants.OBSTACLE_HEIGHT
-        )
-        pygame.draw.rect(screen, constants.OBSTACLE_COLOR, obstacle_rect)
+# Pixelated player circle: squares of PLAYER_PIXEL_SIZE on a grid of this radius
+PLAYER_PIXEL_SIZE = 3
+PLAYER_PIXEL_RADIUS = 8
+TEXT_CACHE_SIZE = 256
+
+# Surfaces that never change are baked once and blitted every frame
+_player_sprites = {}
+_obstacle_sprite = None
+_background = None
+_text_surfaces = {}
+
+def player_sprite(color):
+    """Pixelated circle sprite for a fitness color, built on first use"""
+    sprite = _player_sprites.get(color)
+    if sprite is not None:
+        return sprite
+    radius, pixel_size = PLAYER_PIXEL_RADIUS, PLAYER_PIXEL_SIZE
+    fill_color = tuple(color[:3])
+    # Darker outline color
+    outline_color = tuple(max(0, c - 50) for c in color[:3])
+    sprite = pygame.Surface(((2 * radius + 1) * pixel_size,) * 2, pygame.SRCALPHA)
+    for y in range(-radius, radius + 1):
+        for x in range(-radius, radius + 1):
+            distance = (x * x + y * y) ** 0.5
+            if distance <= radius:
+                # Outline for edge pixels, filled pixels inside
+                pixel_color = outline_color if distance > radius - 1.5 else fill_color
+                sprite.fill(pixel_color, ((x + radius) * pixel_size, (y + radius) * pixel_size,
+                                          pixel_size, pixel_size))
+    _player_sprites[color] = sprite
+    return sprite
+
+def draw_player_sprite(screen, color, center):
+    """Blit the cached player sprite centered the same way as the per-pixel circle"""
+    offset = PLAYER_PIXEL_RADIUS * PLAYER_PIXEL_SIZE
+    screen.blit(player_sprite(color), (center[0] - offset, center[1] - offset))
+
+def draw_background(screen):
+    """Background color and lane lines from one cached surface"""
+    global _background
+    if _background is None:
+        _background = pygame.Surface((constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT))
+        _background.fill(constants.BACKGROUND_COLOR)
+        for x in constants.LANE_LINES:
+            pygame.draw.line(_background, constants.LINE_COLOR, (x, 0), (x, constants.SCREEN_HEIGHT), 2)
+    screen.blit(_background, (0, 0))
+
+def draw_obstacles(screen, game_state):
+    """Blit every obstacle sprite in one Surface.blits batch"""
+    global _obstacle_sprite
+    if _obstacle_sprite is None:
+        _obstacle_sprite = pygame.Surface((constants.OBSTACLE_WIDTH, constants.OBSTACLE_HEIGHT))
+        _obstacle_sprite.fill(constants.OBSTACLE_COLOR)
+    obstacle_lane, obstacle_y = game_state.obstacle_positions()
+    lane_left = [x - constants.OBSTACLE_WIDTH // 2 for x in constants.LANE_X]
+    screen.blits([(_obstacle_sprite, (lane_left[lane], y))
+                  for lane, y in zip(obstacle_lane.tolist(), obstacle_y.tolist())], doreturn=False)
+
+def render_text(font, text, color=constants.TEXT_COLOR):
+    """font.render, but a HUD string is only rendered again when its text changes"""
+    key = (font, text, color)
+    surface = _text_surfaces.get(key)
+    if surface is None:
+        if len(_text_surfaces) >= TEXT_CACHE_SIZE:
+            _text_surfaces.clear()
+        surface = _text_surfaces[key] = font.render(text, True, color)
+    return surface
 '''        
 def show_game_over(screen, score):
     """Optimized game over screen with pre-created surfaces"""
@@ -0,0 +1,27 @@
+import numpy as np
+
+# Independent, reproducible RNG streams derived from one base seed:
+# every generation gets its own stream for genetic operators and its own
+# episode seed, every environment of a generation gets its own seed, and
+# every island of an island-model run gets its own base seed.
+
+
+def generation_seed(base_seed, generation):
+    """Episode seed of one generation"""
+    return int(np.random.SeedSequence([base_seed, generation, 0]).generate_state(1)[0])
+
+
+def generation_rng(base_seed, generation):
+    """np.random.Generator for the genetic operators of one generation"""
+    return np.random.default_rng(np.random.SeedSequence([base_seed, generation, 1]))
+
+
+def environment_seeds(seed, environments):
+    """Seeds of the environments evaluated for one episode seed"""
+    children = np.random.SeedSequence(seed).spawn(environments)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def island_seed(base_seed, island):
+    """Base seed of one island, from which all of its generation streams derive"""
+    return int(np.random.SeedSequence([base_seed, island, 2]).generate_state(1)[0])
@@ -0,0 +1,50 @@
+import numpy as np
+import constants
+
+# Observation layout: one-hot lane (3), obstacle lane, obstacle distance,
+# current lane safety, left lane safety, right lane safety
+OBSERVATION_SIZE = 8
+LOOKAHEAD = 300  # Pixels above the player that count as a threat
+NO_OBSTACLE_DISTANCE = 999
+
+
+def lane_safety(ahead_y):
+    """Safety of every lane (0=dangerous, 1=safe) from the closest obstacle ahead in it"""
+    distance = constants.PLAYER_Y - ahead_y
+    threat = (distance > 0) & (distance < LOOKAHEAD)
+    return np.where(threat, distance / LOOKAHEAD, 1.0)
+
+
+def observations_from_ahead(ahead_y):
+    """Build observations from the closest-ahead obstacle y of every lane.
+
+    ahead_y has shape (..., NUM_LANES) with -inf for lanes with nothing ahead;
+    the result has shape (..., NUM_LANES, 8), one observation per player lane.
+    """
+    lead = ahead_y.shape[:-1]
+    observations = np.zeros(lead + (constants.NUM_LANES, OBSERVATION_SIZE))
+    observations[..., :constants.NUM_LANES] = np.eye(constants.NUM_LANES)
+
+    # Closest obstacle ahead of the player (shared by every lane)
+    closest_lane = np.argmax(ahead_y, axis=-1)
+    closest_y = np.take_along_axis(ahead_y, closest_lane[..., None], axis=-1)[..., 0]
+    found = np.isfinite(closest_y)
+    observations[..., 3] = np.where(found, closest_lane, -1)[..., None]
+    observations[..., 4] = np.where(found, constants.PLAYER_Y - closest_y, NO_OBSTACLE_DISTANCE)[..., None]
+
+    # Safety of the current lane and its neighbours (0 outside the track)
+    safety = lane_safety(ahead_y)
+    observations[..., 5] = safety
+    observations[..., 1:, 6] = safety[..., :-1]
+    observations[..., :-1, 7] = safety[..., 1:]
+    return observations
+
+
+def lane_observations(game_state):
+    """Compute the observation for each lane once per frame.
+
+    All agents share the obstacle field and player y, so an agent's state only
+    depends on its lane. Returns a (NUM_LANES, 8) array to be indexed by lane.
+    """
+    # The closest obstacle ahead in a lane is also the most dangerous one in it
+    return observations_from_ahead(game_state.closest_ahead_y())
@@ -0,0 +1,66 @@
+import numpy as np
+from environments import evaluate_environments
+from game_state import collision_mask, update_obstacles
+from player import Player
+from profiler import STAGE_COLLISION, STAGE_OBSTACLES, STAGE_SENSE, STAGE_THINK
+from seeding import environment_seeds
+from sensors import lane_observations
+
+
+def step_frame(game_state, population, recorder=None, profiler=None):
+    """Advance the whole population by one frame (think, score, obstacles, collisions).
+
+    If a recording.PopulationRecorder is given, the frame's actions and
+    difficulty tier are appended to it. If a profiler.FrameProfiler is given,
+    each stage is timed (moving and scoring count towards "think").
+    """
+    if not population.alive_count:
+        return
+
+    # Sensors are computed once per lane and gathered by each agent's lane
+    np.take(lane_observations(game_state), population.lane, axis=0, out=population.states)
+    if profiler is not None:
+        profiler.lap(STAGE_SENSE)
+    # AI decision-making for the whole population in one batched forward pass;
+    # clones share a lane (and so an input) all episode, so each genome runs once
+    actions = population.brain.predict(population.states, population.alive, clones_share_input=True)
+    population.apply_actions(actions)
+    population.update_scores()
+    if profiler is not None:
+        profiler.lap(STAGE_THINK)
+
+    # Update obstacles once per frame (using best active player for difficulty)
+    update_obstacles(game_state, Player(population=population, index=population.best_index))
+    population.max_tier = max(population.max_tier, game_state.tier)
+    if recorder is not None:
+        recorder.record(actions, game_state.tier)
+    if profiler is not None:
+        profiler.lap(STAGE_OBSTACLES)
+
+    # Check for collisions for all active players with one vectorized lane test
+    population.kill(collision_mask(game_state, population.lane))
+    if profiler is not None:
+        profiler.lap(STAGE_COLLISION)
+
+
+def simulate_episode(game_state, population, max_frames=None, recorder=None):
+    """Run frames until every agent has died (or max_frames is reached); returns the frame count"""
+    frames = 0
+    while population.alive_count and (max_frames is None or frames < max_frames):
+        step_frame(game_state, population, recorder)
+        frames += 1
+    return frames
+
+
+def evaluate_population(population, game_state, episode_seed, environments=1, max_frames=None):
+    """Evaluate a whole Population on its episode seed (capped at max_frames).
+
+    With environments > 1, stats are means over that many environments
+    derived from episode_seed; otherwise game_state plays the episode.
+    """
+    if environments > 1:
+        evaluate_environments(population, environment_seeds(episode_seed, environments), max_frames)
+        return
+    game_state.reset(episode_seed)
+    simulate_episode(game_state, population, max_frames)
+    population.kill(population.alive)  # Agents still alive at the frame cap
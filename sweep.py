@@ -0,0 +1,233 @@
+import argparse
+import contextlib
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import constants
+import generation
+from game_state import GameState
+from population import Population
+from seeding import generation_rng, generation_seed
+from simulation import evaluate_population
+
+# Hyperparameter sweeps. A spec (JSON) lists the values to try, either as a
+# grid or as a random search space, plus the fixed settings of every run:
+#
+#   {"strategy": "ga", "seeds": [1, 2, 3], "generations": 50,
+#    "target_score": 1000, "max_frames": 5000,
+#    "grid": {"mutation_rate": [0.005, 0.01, 0.02], "temp": [0.1, 0.2]}}
+#
+# "random" takes the place of "grid" with "samples" draws; each parameter is
+# a list to choose from or {"low": a, "high": b, "log": false} to sample.
+# Every (parameters, seed) pair is one job, cached on disk by config hash.
+DEFAULT_CACHE_DIR = "sweep_cache"
+RUN_SETTINGS = {"strategy": "ga", "generations": 50, "target_score": 1000,
+                "max_frames": constants.MAX_EPISODE_FRAMES}
+
+
+def strategy_parameters(name):
+    """Sweepable parameters of a strategy: its constructor settings plus population_size"""
+    return set(inspect.signature(generation.STRATEGIES[name]).parameters) | {"population_size"}
+
+
+def grid_points(grid):
+    """Every combination of the grid's values, as parameter dicts"""
+    names = sorted(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def sample_value(values, rng):
+    """One draw from a list of choices or a {"low", "high", "log"} range"""
+    if isinstance(values, list):
+        return values[rng.integers(len(values))]
+    low, high = values["low"], values["high"]
+    if values.get("log"):
+        return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+    if isinstance(low, int) and isinstance(high, int):
+        return int(rng.integers(low, high + 1))
+    return float(rng.uniform(low, high))
+
+
+def random_points(space, samples, seed=0):
+    """samples random parameter dicts; the same seed always draws the same points"""
+    rng = np.random.default_rng(seed)
+    for _ in range(samples):
+        yield {name: sample_value(space[name], rng) for name in sorted(space)}
+
+
+def expand_spec(spec):
+    """Job configs of a spec: one per (parameter point, seed), in a stable order"""
+    if "grid" in spec:
+        points = grid_points(spec["grid"])
+    elif "random" in spec:
+        points = random_points(spec["random"], spec.get("samples", 10), spec.get("search_seed", 0))
+    else:
+        raise ValueError("spec needs a 'grid' or 'random' section")
+
+    settings = {name: spec.get(name, default) for name, default in RUN_SETTINGS.items()}
+    configs = []
+    for point in points:
+        for seed in spec.get("seeds", [0]):
+            config = dict(settings, seed=seed, **point)
+            unknown = set(point) - {"strategy"} - strategy_parameters(config["strategy"])
+            if unknown:
+                raise ValueError(f"unknown {config['strategy']} parameter(s): {', '.join(sorted(unknown))}")
+            configs.append(config)
+    return configs
+
+
+def config_hash(config):
+    """Stable key of a job config (key order does not matter)"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ResultCache:
+    """Finished job results, one JSON file per config hash.
+
+    Files are written to a temporary name and renamed into place, so an
+    interrupted sweep never leaves a partial result behind.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, result):
+        path = self.path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+
+def run_config(config):
+    """Worker: train headless until the target score or the generation limit.
+
+    Returns generations_to_target (None if never reached), the best score,
+    the generations played and the wall time they took.
+    """
+    settings = dict(config)
+    strategy_name = settings.pop("strategy")
+    seed = settings.pop("seed")
+    generations = settings.pop("generations")
+    target_score = settings.pop("target_score")
+    max_frames = settings.pop("max_frames") or None
+    size = settings.pop("population_size", constants.POPULATION_SIZE)
+    strategy = generation.make_strategy(strategy_name, **settings)
+
+    start = time.perf_counter()
+    population = Population.random(size, generation_rng(seed, 0))
+    game_state = GameState()
+    best_score = 0
+    reached = None
+    generation_number = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while generation_number < generations:
+            evaluate_population(population, game_state, generation_seed(seed, generation_number), 1, max_frames)
+            best_score = max(best_score, int(population.score.max()))
+            generation_number += 1
+            if best_score >= target_score:
+                reached = generation_number
+                break
+            population = strategy.next_generation(population, rng=generation_rng(seed, generation_number),
+                                                  population_size=size)
+    return {
+        "generations_to_target": reached,
+        "best_score": best_score,
+        "generations": generation_number,
+        "wall_time": round(time.perf_counter() - start, 3),
+    }
+
+
+def run_sweep(configs, cache, workers=None):
+    """Run every config not yet in the cache on a process pool; returns all results in config order"""
+    jobs = {config_hash(config): config for config in configs}
+    pending = {key: config for key, config in jobs.items() if cache.get(key) is None}
+    print(f"{len(jobs)} configs: {len(jobs) - len(pending)} cached, {len(pending)} to run")
+
+    if pending:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = {executor.submit(run_config, config): key for key, config in pending.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                result = dict(future.result(), config=pending[key])
+                cache.put(key, result)
+                print(f"[{done}/{len(pending)}] {key} {describe(pending[key])}: "
+                      f"{result['generations_to_target']} generations to target, {result['wall_time']:.1f} s")
+    return [cache.get(key) for key in jobs]
+
+
+def describe(config):
+    """Short text of a config's swept parameters (everything but the run settings)"""
+    fixed = set(RUN_SETTINGS) - {"strategy"} | {"seed"}
+    return " ".join(f"{name}={value:.4g}" if isinstance(value, float) else f"{name}={value}"
+                    for name, value in sorted(config.items()) if name not in fixed)
+
+
+def summarize(results):
+    """Rows per parameter point, aggregated over seeds, best first.
+
+    A point ranks by how many seeds reached the target, then by the median
+    generations to target of those seeds, then by mean wall time.
+    """
+    points = {}
+    for result in results:
+        points.setdefault(describe(result["config"]), []).append(result)
+    rows = []
+    for name, runs in points.items():
+        reached = [run["generations_to_target"] for run in runs if run["generations_to_target"] is not None]
+        rows.append({
+            "parameters": name,
+            "reached": len(reached),
+            "runs": len(runs),
+            "median_generations": float(np.median(reached)) if reached else None,
+            "mean_wall_time": float(np.mean([run["wall_time"] for run in runs])),
+            "best_score": max(run["best_score"] for run in runs),
+        })
+    rows.sort(key=lambda row: (-row["reached"], row["median_generations"] or float("inf"), row["mean_wall_time"]))
+    return rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Temple Run AI hyperparameter sweeps")
+    parser.add_argument("spec", help="JSON sweep spec (grid or random search)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="training jobs run at once (default: one per CPU)")
+    parser.add_argument("--cache", metavar="DIR", default=DEFAULT_CACHE_DIR,
+                        help="directory of finished results, keyed by config hash")
+    parser.add_argument("--top", type=int, default=10,
+                        help="parameter points to show in the summary")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    with open(args.spec) as f:
+        spec = json.load(f)
+    try:
+        configs = expand_spec(spec)
+    except ValueError as error:
+        sys.exit(f"Invalid sweep spec: {error}")
+    results = run_sweep(configs, ResultCache(args.cache), args.workers)
+    print(f"{'reached':>8} {'median gens':>11} {'wall s':>8} {'best':>7}  parameters")
+    for row in summarize(results)[:args.top]:
+        median = f"{row['median_generations']:.1f}" if row["median_generations"] is not None else "-"
+        print(f"{row['reached']:>4}/{row['runs']:<3} {median:>11} {row['mean_wall_time']:>8.1f} "
+              f"{row['best_score']:>7}  {row['parameters']}")
@@ -0,0 +1,157 @@
+import csv
+import json
+import os
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+SCORE_PERCENTILES = (50, 90, 99)
+
+
+def generation_record(generation, population, elapsed, run_time, environments=1):
+    """One flat telemetry record for an evaluated (and evolved) generation.
+
+    elapsed is the wall time spent on this generation, run_time the time
+    since training started. Every agent alive for a frame is one agent-step;
+    with several environments, survival times are per-environment means.
+    """
+    score = population.score
+    agent_steps = int(population.survival_time.sum()) * environments
+    record = {
+        "generation": generation,
+        "wall_time": round(run_time, 3),
+        "generation_seconds": round(elapsed, 3),
+        "agent_steps_per_sec": round(agent_steps / elapsed, 1) if elapsed > 0 else 0.0,
+        "score_max": int(score.max()),
+        "score_mean": round(float(score.mean()), 3),
+    }
+    for q, value in zip(SCORE_PERCENTILES, np.percentile(score, SCORE_PERCENTILES)):
+        record[f"score_p{q}"] = float(value)
+    record["best_fitness"] = float(population.fitness.max())
+    record["max_tier"] = int(population.max_tier)  # Highest tier the simulation actually ran at
+    if population.diversity_stats is not None:
+        record["diversity"] = round(float(population.diversity_stats["diversity"]), 6)
+        record["clusters"] = population.diversity_stats["clusters"]
+    if population.evolution_stats is not None:
+        record.update(population.evolution_stats)
+    return record
+
+
+def summary_line(record):
+    """Short human-readable console line for a record"""
+    return (f"Generation {record['generation']}: max score {record['score_max']}, "
+            f"mean {record['score_mean']:.1f}, diversity {record.get('diversity', float('nan')):.3f}, "
+            f"{record['agent_steps_per_sec']:,.0f} agent-steps/s")
+
+
+class TelemetrySink:
+    """Streams generation records to a JSONL or CSV file from a background thread.
+
+    emit() only enqueues, so the training loop never waits on disk. The file
+    format follows the path's extension (.csv, otherwise JSON lines). With
+    http_port, the latest record is also served on localhost: GET /metrics
+    in Prometheus text format, anything else as JSON.
+    """
+    def __init__(self, path=None, http_port=None):
+        self.path = path
+        self.latest = None
+        self._records = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        self._server = None
+        if http_port is not None:
+            self._server = ThreadingHTTPServer(("127.0.0.1", http_port), _handler(self))
+            threading.Thread(target=self._server.serve_forever, name="telemetry-http", daemon=True).start()
+
+    def emit(self, record):
+        self.latest = record
+        self._records.put(record)
+
+    def close(self):
+        """Flush every queued record and stop the writer (and HTTP server)"""
+        self._records.put(None)
+        self._thread.join()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _run(self):
+        if self.path is None:
+            while self._records.get() is not None:
+                pass
+            return
+        record = self._records.get()
+        if record is None:
+            return
+        path = self.path
+        if path.endswith(".csv"):
+            path = csv_path_for(path, list(record))
+        with open(path, "a", newline="") as f:
+            writer = None
+            while record is not None:
+                if not path.endswith(".csv"):
+                    f.write(json.dumps(record) + "\n")
+                else:
+                    if writer is None:
+                        writer = csv.DictWriter(f, fieldnames=list(record), extrasaction="ignore")
+                        if f.tell() == 0:
+                            writer.writeheader()
+                    writer.writerow(record)
+                f.flush()
+                record = self._records.get()
+
+
+def csv_header(path):
+    """First row of an existing CSV file, or None if it is missing or empty"""
+    try:
+        with open(path, newline="") as f:
+            return next(csv.reader(f), None)
+    except FileNotFoundError:
+        return None
+
+
+def csv_path_for(path, fieldnames):
+    """path, or the first free numbered sibling if path holds other columns.
+
+    Appending rows under a header with different columns would misalign
+    every field, so a mismatching file is left alone and a fresh one used.
+    """
+    root, ext = os.path.splitext(path)
+    candidate, n = path, 0
+    while csv_header(candidate) not in (None, fieldnames):
+        n += 1
+        candidate = f"{root}.{n}{ext}"
+    if candidate != path:
+        print(f"Telemetry: {path} has different columns, writing to {candidate}")
+    return candidate
+
+
+def prometheus_text(record):
+    """Numeric fields of a record as Prometheus exposition text"""
+    lines = []
+    for key, value in record.items():
+        if isinstance(value, (int, float)):
+            lines.append(f"temple_run_{key} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _handler(sink):
+    class TelemetryHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            record = sink.latest or {}
+            if self.path == "/metrics":
+                body, content_type = prometheus_text(record), "text/plain; version=0.0.4"
+            else:
+                body, content_type = json.dumps(record), "application/json"
+            body = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the training console
+
+    return TelemetryHandler